@@ -0,0 +1,56 @@
+import re
+from multiprocessing import Pool
+
+email_pattern = r'[\w\.-]+@[\w\.-]+\.\w+'
+phone_pattern = r'\b\d{3}[-.\s]??\d{3}[-.\s]??\d{4}\b'
+name_pattern = r'[A-Z][a-z]+\s[A-Z][a-z]+'
+
+REPLACEMENTS = {"EMAIL": "[EMAIL]", "PHONE": "[PHONE]", "NAME": "[NAME]"}
+_DIGIT = re.compile(r"\d")
+
+
+def _combined(with_email, with_phone):
+    # One alternation so each string is scanned once. Order matters: an email is
+    # claimed before its local part can be read as a name.
+    parts = []
+    if with_email:
+        parts.append(f"(?P<EMAIL>{email_pattern})")
+    if with_phone:
+        parts.append(f"(?P<PHONE>{phone_pattern})")
+    parts.append(f"(?P<NAME>{name_pattern})")
+    return re.compile("|".join(parts))
+
+
+# The email and phone alternatives dominate the scan cost, so strings without an '@'
+# or a digit use a pattern that leaves them out; those alternatives could not match
+# there, so the output is the same as PII_PATTERN's. Keyed by ('@' in text, has a digit).
+PII_PATTERNS = {
+    (with_email, with_phone): _combined(with_email, with_phone)
+    for with_email in (False, True)
+    for with_phone in (False, True)
+}
+PII_PATTERN = PII_PATTERNS[True, True]
+
+
+def _replace(match):
+    return REPLACEMENTS[match.lastgroup]
+
+
+def anonymize(text):
+    """Redacts emails, phone numbers and names in a single pass and returns the redacted text."""
+    pattern = PII_PATTERNS["@" in text, _DIGIT.search(text) is not None]
+    return pattern.sub(_replace, text)
+
+
+def anonymize_many(texts, processes=None, chunksize=1000):
+    """
+    Lazily anonymizes an iterable of strings, preserving order.
+    With processes > 1 the work is spread over a multiprocessing pool, which pays off
+    for large corpora such as full article bodies; small inputs are faster inline.
+    """
+    if not processes or processes <= 1:
+        for text in texts:
+            yield anonymize(text)
+        return
+    with Pool(processes) as pool:
+        yield from pool.imap(anonymize, texts, chunksize)
@@ -0,0 +1,78 @@
+import argparse
+import os
+import random
+import re
+import time
+
+from anonymizer import PII_PATTERN, REPLACEMENTS, anonymize_many, email_pattern, name_pattern, phone_pattern
+
+FIRST_NAMES = ["Albert", "Marie", "Jane", "Thomas", "Ada", "Steve", "Grace", "Linus"]
+LAST_NAMES = ["Einstein", "Curie", "Austen", "Edison", "Lovelace", "Jobs", "Hopper", "Torvalds"]
+WORDS = ["the", "market", "open", "source", "release", "court", "study", "finds", "new", "model", "rates", "climate"]
+
+
+def synthetic_strings(count, seed=0):
+    """Headline-sized strings where roughly a third carry an email, phone number or name."""
+    rng = random.Random(seed)
+    strings = []
+    for _ in range(count):
+        words = rng.choices(WORDS, k=rng.randint(6, 14))
+        roll = rng.random()
+        if roll < 0.1:
+            words.insert(rng.randrange(len(words)), f"{rng.choice(FIRST_NAMES).lower()}@example.com")
+        elif roll < 0.2:
+            words.insert(rng.randrange(len(words)), f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}")
+        elif roll < 0.35:
+            words.insert(rng.randrange(len(words)), f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}")
+        strings.append(" ".join(words))
+    return strings
+
+
+def three_pass(text):
+    """What the scripts used to do: three uncompiled re.sub calls over the original text."""
+    anonymized_email = re.sub(email_pattern, '[EMAIL]', text)
+    anonymized_phone = re.sub(phone_pattern, '[PHONE]', text)
+    anonymized_name = re.sub(name_pattern, '[NAME]', text)
+    return anonymized_name
+
+
+# Names running into emails and phones, where a shortcut in the pattern would show.
+EDGE_CASES = [
+    "Mary Jane123@gmail.com",
+    "Mary Jane.doe@example.com wrote",
+    "contact Ada Lovelace-ada@example.org or 555-123-4567",
+    "Grace Hopper555 123 4567",
+    "a.b@c.d Thomas Edison",
+]
+
+
+def reference(text):
+    """The plain combined alternation over all three patterns, without any shortcut."""
+    return PII_PATTERN.sub(lambda match: REPLACEMENTS[match.lastgroup], text)
+
+
+def timed(label, fn, count):
+    start_time = time.time()
+    fn()
+    elapsed = time.time() - start_time
+    print(f"{label:<28} {elapsed:7.2f}s  {count / elapsed / 1e6:6.2f}M strings/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Anonymizer throughput over synthetic strings.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    strings = synthetic_strings(args.count)
+    print(f"{args.count} synthetic strings, {sum(map(len, strings)) / 1e6:.1f}M characters\n")
+    timed("three re.sub passes", lambda: [three_pass(s) for s in strings], args.count)
+    timed("single pass", lambda: list(anonymize_many(strings)), args.count)
+    checked = strings + EDGE_CASES
+    mismatches = sum(a != b for a, b in zip(anonymize_many(checked), map(reference, checked)))
+    print(f"{'output vs combined pattern':<28} {mismatches} mismatches in {len(checked)} strings")
+    timed(f"single pass, {args.processes} processes", lambda: list(anonymize_many(strings, processes=args.processes)), args.count)
+
+
+if __name__ == "__main__":
+    main()
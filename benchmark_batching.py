@@ -0,0 +1,55 @@
+import argparse
+import time
+
+from model import TextGenModel
+from semantics import analyze_titles
+
+# Headlines of the kind the scrapers collect, mixed lengths on purpose so the
+# length bucketing has something to do.
+SAMPLE_TITLES = [
+    "Show HN: A tiny SQLite extension for vector search",
+    "Apple sues former engineer over leaked Vision Pro plans",
+    "Why the Fed is unlikely to cut rates before the election",
+    "Rust 1.80 released",
+    "Researchers find microplastics in every human placenta sample tested in a new study from New Mexico",
+    "The EU's AI Act enters into force: what changes for startups",
+    "Ask HN: How do you keep on-call from burning out your team?",
+    "NASA delays Artemis II crew launch to 2026",
+    "Climate change is making hurricanes intensify faster, study finds",
+    "Microsoft, OpenAI face new copyright lawsuit from newspaper publishers",
+    "Linux 6.10 brings new memory sealing syscall",
+    "Teachers say phone bans have changed the atmosphere in their classrooms",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-title loop vs batched semantic analysis throughput.")
+    parser.add_argument("--titles", type=int, default=32, help="number of titles to analyse")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--max-new-tokens", type=int, default=150)
+    args = parser.parse_args()
+
+    titles = [SAMPLE_TITLES[i % len(SAMPLE_TITLES)] for i in range(args.titles)]
+    # Greedy decoding so both paths do comparable work, and no cache so every title hits the model.
+    generate_kwargs = {"do_sample": False, "max_new_tokens": args.max_new_tokens, "cache": False}
+
+    print("_________________________________Loading the model_________________________________")
+    TextGenModel.get_instance()
+    analyze_titles(titles[:2], batch_size=2, **generate_kwargs)  # warm-up
+
+    start_time = time.time()
+    for title in titles:
+        analyze_titles([title], batch_size=1, **generate_kwargs)
+    loop_elapsed = time.time() - start_time
+    print(f"Per-title loop : {len(titles)} titles in {loop_elapsed:.2f}s ({len(titles) / loop_elapsed:.2f} titles/s)")
+
+    for batch_size in args.batch_sizes:
+        start_time = time.time()
+        analyze_titles(titles, batch_size=batch_size, **generate_kwargs)
+        elapsed = time.time() - start_time
+        print(f"Batched (bs={batch_size:<3}): {len(titles)} titles in {elapsed:.2f}s "
+              f"({len(titles) / elapsed:.2f} titles/s, {loop_elapsed / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
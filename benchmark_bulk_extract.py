@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import time
+from playwright.async_api import async_playwright
+
+from bulk_extract import extract_records
+
+FIELDS = {"title": "span.text", "author": "small.author", "tags": ".tags"}
+
+
+def fixture_page(count):
+    """A quotes-style listing with `count` items, built locally so no network is involved."""
+    items = "".join(
+        f'<div class="quote"><span class="text">Quote number {i} about nothing in particular.</span>'
+        f'<span>by <small class="author">Author {i % 97}</small> <a href="/author/{i % 97}">(about)</a></span>'
+        f'<div class="tags">Tags: <a class="tag" href="/tag/t{i % 13}">t{i % 13}</a></div></div>'
+        for i in range(count)
+    )
+    return f"<html><body><div class='container'>{items}</div></body></html>"
+
+
+class CountingPage:
+    """Counts calls that cross to the browser, on the page and on every handle it returns."""
+
+    def __init__(self, target, counter=None):
+        self.target = target
+        self.counter = counter if counter is not None else [0]
+
+    def __getattr__(self, name):
+        attr = getattr(self.target, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            self.counter[0] += 1
+            result = await attr(*args, **kwargs)
+            if isinstance(result, list):
+                return [CountingPage(r, self.counter) if hasattr(r, "query_selector") else r for r in result]
+            if hasattr(result, "query_selector"):
+                return CountingPage(result, self.counter)
+            return result
+        return call
+
+
+async def per_element(page):
+    """The scripts' original approach: query_selector + inner_text per item and field."""
+    records = []
+    for item in await page.query_selector_all(".quote"):
+        record = {}
+        for name, selector in FIELDS.items():
+            element = await item.query_selector(selector)
+            record[name] = await element.inner_text() if element else None
+        records.append(record)
+    return records
+
+
+async def bulk(page):
+    return await extract_records(page, ".quote", FIELDS)
+
+
+async def run(counts):
+    print(f"{'items':>6} {'mode':<12} {'round trips':>12} {'time':>9}")
+    async with async_playwright() as p:
+        browser = await p.chromium.launch()
+        page = await browser.new_page()
+        for count in counts:
+            await page.set_content(fixture_page(count))
+            results = {}
+            for mode, extract in (("per-element", per_element), ("bulk", bulk)):
+                counted = CountingPage(page)
+                start_time = time.time()
+                results[mode] = await extract(counted)
+                elapsed = time.time() - start_time
+                print(f"{count:>6} {mode:<12} {counted.counter[0]:>12} {elapsed:>8.3f}s")
+            assert results["per-element"] == results["bulk"], "bulk extraction returned different records"
+        await browser.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-element vs single-evaluate extraction on a local page.")
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+    asyncio.run(run(args.items))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import time
+from playwright.sync_api import sync_playwright
+
+from html_compact import compact_html
+from model import TextGenModel
+from selector_llm import get_css_selector_from_llm
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# fixture file, item selector, field description, hand-written reference selector
+CASES = [
+    ("quotes.html", ".quote", "the author's name", ".author"),
+    ("hackernews.html", "td.title:has(.titleline)", "title line", ".titleline"),
+    ("theconversation.html", ".drop-shadow-dark", "the headline text", "h3 > span"),
+    ("arstechnica.html", "article", "the headline link", "h2 > a"),
+]
+
+
+def field_text(item, selector):
+    try:
+        element = item.query_selector(selector)
+    except Exception:
+        return None
+    return element.inner_text() if element else None
+
+
+def main():
+    tokenizer = TextGenModel.get_instance()["tokenizer"]
+
+    def count(text):
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    print(f"{'fixture':<22} {'mode':<8} {'tokens':>7} {'latency':>8} {'accuracy':>9}  selector")
+    with sync_playwright() as p:
+        browser = p.chromium.launch()
+        page = browser.new_page()
+        for fixture, item_selector, description, reference in CASES:
+            with open(os.path.join(FIXTURES_DIR, fixture), encoding="utf-8") as f:
+                page.set_content(f.read())
+            items = [item for item in page.query_selector_all(item_selector) if field_text(item, reference)]
+            html = items[0].inner_html()
+            for mode, compact in (("raw", False), ("compact", True)):
+                tokens = count(compact_html(html, tokenizer) if compact else html)
+                start_time = time.time()
+                selector = get_css_selector_from_llm(html, description, cache=False, compact=compact)
+                latency = time.time() - start_time
+                correct = sum(field_text(item, selector) == field_text(item, reference) for item in items)
+                print(f"{fixture:<22} {mode:<8} {tokens:>7} {latency:>7.2f}s {correct / len(items):>8.0%}  {selector}")
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
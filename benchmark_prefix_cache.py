@@ -0,0 +1,55 @@
+import argparse
+import time
+import torch
+
+from benchmark_batching import SAMPLE_TITLES
+from model import TextGenModel
+from prefix_cache import expand_prefix_cache, prefix_kv_cache, split_chat_template, split_matches_full
+from semantics import PROMPTS, build_semantics_prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefill time per title with and without the cached prompt prefix.")
+    parser.add_argument("--kind", default="news", choices=sorted(PROMPTS))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    model_data = TextGenModel.get_instance()
+    model = model_data["model"]
+    tokenizer = model_data["tokenizer"]
+    template = PROMPTS[args.kind]
+    prefix_text, lead_text, tail_text = split_chat_template(tokenizer, template["system"], template["user"], "title")
+    prefix_ids, layers = prefix_kv_cache.get(model, tokenizer, prefix_text)
+    print(f"Shared prefix: {len(prefix_ids)} tokens")
+    matching = sum(split_matches_full(tokenizer, prefix_text, lead_text + title + tail_text) for title in SAMPLE_TITLES)
+    print(f"Prefix + suffix tokens equal the full prompt's for {matching}/{len(SAMPLE_TITLES)} titles\n")
+
+    full_seconds = 0.0
+    cached_seconds = 0.0
+    full_tokens = 0
+    cached_tokens = 0
+    with torch.inference_mode():
+        for _ in range(args.repeats):
+            for title in SAMPLE_TITLES:
+                full_ids = tokenizer(build_semantics_prompt(tokenizer, title, args.kind), return_tensors="pt")["input_ids"]
+                start_time = time.perf_counter()
+                model(input_ids=full_ids, use_cache=True)
+                full_seconds += time.perf_counter() - start_time
+                full_tokens += full_ids.shape[1]
+
+                suffix_ids = tokenizer(lead_text + title + tail_text, add_special_tokens=False, return_tensors="pt")["input_ids"]
+                past_key_values = expand_prefix_cache(layers, 1)
+                start_time = time.perf_counter()
+                model(input_ids=suffix_ids, past_key_values=past_key_values, use_cache=True)
+                cached_seconds += time.perf_counter() - start_time
+                cached_tokens += suffix_ids.shape[1]
+
+    items = args.repeats * len(SAMPLE_TITLES)
+    print(f"{'':<14} {'tokens/item':>12} {'prefill ms/item':>16}")
+    print(f"{'full prompt':<14} {full_tokens / items:>12.1f} {full_seconds / items * 1000:>16.1f}")
+    print(f"{'cached prefix':<14} {cached_tokens / items:>12.1f} {cached_seconds / items * 1000:>16.1f}")
+    print(f"\nPrefill reduction: {(1 - cached_seconds / full_seconds) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+# Each measurement runs in a fresh interpreter so nothing is shared between runs
+# except the OS page cache and the on-disk int8 cache.
+CHILD_SCRIPT = """
+import json, resource, sys, time
+start_time = time.time()
+from model import TextGenModel
+TextGenModel.configure(**json.loads(sys.argv[1]))
+TextGenModel.get_instance()
+load_seconds = time.time() - start_time
+print(json.dumps({
+    "load_seconds": load_seconds,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+VARIANTS = {
+    "fp32": {"quantize": False},
+    "int8": {"quantize": True},
+}
+
+
+def measure(options):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD_SCRIPT, json.dumps(options)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs warm TextGenModel load time and resident memory.")
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads() value")
+    parser.add_argument("--cache-dir", default=".model_cache_bench")
+    args = parser.parse_args()
+
+    # Cold for int8 means the quantized copy has to be built; warm means it is reused.
+    shutil.rmtree(args.cache_dir, ignore_errors=True)
+    print(f"{'variant':<8} {'run':<5} {'load (s)':>9} {'max RSS (MB)':>13}")
+    for name, options in VARIANTS.items():
+        options = dict(options, num_threads=args.threads, cache_dir=args.cache_dir)
+        for run in ("cold", "warm"):
+            result = measure(options)
+            print(f"{name:<8} {run:<5} {result['load_seconds']:>9.2f} {result['max_rss_mb']:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+
+# A fresh LLM cache per run, so the suite measures inference rather than cache hits.
+os.environ.setdefault("LLM_CACHE_DIR", tempfile.mkdtemp(prefix="llm_cache_bench_"))
+
+import argparse
+import asyncio
+import dataclasses
+import functools
+import json
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from crawler import crawl
+from metrics import metrics
+from output_sinks import ResultWriter, open_sink
+from sites import SPECS_DIR, load_specs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(port=0):
+    """Serves fixtures/ on localhost from a background thread; robots.txt is a 404, so everything is allowed."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), functools.partial(_QuietHandler, directory=FIXTURES_DIR))
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server
+
+
+def offline_sites(base_url, pages=1, specs=(SPECS_DIR,)):
+    """The site specs pointed at their saved fixture, fixtures/<site name>.html, `pages` times each."""
+    sites = []
+    for site in load_specs(specs):
+        fixture = f"{site.name}.html"
+        if not os.path.exists(os.path.join(FIXTURES_DIR, fixture)):
+            print(f"[{site.name}] no fixtures/{fixture}, skipped")
+            continue
+        urls = [f"{base_url}/{fixture}?page={page}" for page in range(pages)]
+        sites.append(dataclasses.replace(site, urls=urls))
+    return sites
+
+
+def compare(result, baseline_path, max_regression):
+    """Prints stage means against a saved run; returns False when throughput fell by more than `max_regression`."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n{'stage':<20} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, timer in sorted(result["timers"].items()):
+        before = baseline["timers"].get(name)
+        if before:
+            change = timer["mean"] / before["mean"] - 1 if before["mean"] else 0.0
+            print(f"{name:<20} {before['mean'] * 1000:10.2f}ms {timer['mean'] * 1000:10.2f}ms {change:>+7.0%}")
+    before, now = baseline["run"]["items_per_second"], result["run"]["items_per_second"]
+    change = now / before - 1 if before else 0.0
+    print(f"{'items/s':<20} {before:12.2f} {now:12.2f} {change:>+7.0%}")
+    return change >= -max_regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays the saved fixtures of every site spec through a local server and reports per-stage throughput.")
+    parser.add_argument("--pages", type=int, default=1, help="times each fixture is crawled; repeats hit the selector and LLM caches")
+    parser.add_argument("--max-pages", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--output", help="also stream results to this .jsonl, .parquet or .sqlite file")
+    parser.add_argument("--json", default="bench_metrics.json", help="where to save this run's metrics")
+    parser.add_argument("--baseline", help="metrics JSON of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="fail when items/s drops by more than this fraction")
+    args = parser.parse_args()
+
+    server = serve_fixtures()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    sites = offline_sites(base_url, args.pages)
+    writer = ResultWriter([open_sink(args.output)] if args.output else [])
+    print(f"Replaying {', '.join(site.name for site in sites)} from {base_url}")
+
+    metrics.reset()
+    start_time = time.time()
+    try:
+        pipeline = asyncio.run(crawl(sites, max_pages=args.max_pages, batch_size=args.batch_size, on_result=writer))
+    finally:
+        writer.close()
+        server.shutdown()
+    wall = time.time() - start_time
+
+    pipeline.report()
+    metrics.report()
+    result = metrics.snapshot()
+    result["run"] = {
+        "sites": [site.name for site in sites],
+        "pages": args.pages,
+        "items": writer.results,
+        "wall_seconds": wall,
+        "items_per_second": writer.results / wall if wall else 0.0,
+    }
+    print(f"{writer.results} items in {wall:.2f}s, {result['run']['items_per_second']:.2f} items/s")
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+    print(f"Metrics saved to {args.json}")
+    if args.baseline and not compare(result, args.baseline, args.max_regression):
+        print(f"Throughput regressed by more than {args.max_regression:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from html_compact import compact_html
+
+# Runs in the page: one record per item, each field read with querySelector (or the item
+# itself for a null selector). A field may also be a list with one selector per item.
+EXTRACT_JS = """
+(items, {fields, includeHtml, includeLink}) => items.map((item, index) => {
+    const record = {};
+    for (const [name, spec] of Object.entries(fields)) {
+        const selector = Array.isArray(spec) ? spec[index] : spec;
+        let element = null;
+        try {
+            element = selector ? item.querySelector(selector) : item;
+        } catch (e) {}
+        record[name] = element ? element.innerText : null;
+    }
+    if (includeHtml) record.__html = item.innerHTML;
+    if (includeLink) {
+        const link = item.matches("a[href]") ? item : item.querySelector("a[href]");
+        record.__link = link ? link.href : null;
+    }
+    return record;
+})
+"""
+
+# Runs in the page: whether `selector` matches inside every item at `indexes`.
+VALIDATE_JS = """
+(items, {selector, indexes}) => {
+    try {
+        return indexes.every(index => items[index] && items[index].querySelector(selector) !== null);
+    } catch (e) {
+        return false;
+    }
+}
+"""
+
+
+async def extract_records(page, item_selector, fields, include_html=False, compact=False, include_link=False):
+    """
+    Reads every item matching `item_selector` in a single round trip to the browser.
+    `fields` maps a name to a CSS selector, None for the item's own text, or a list with
+    one selector per item. With `include_html` each record also carries the item's inner
+    HTML under "__html", compacted with compact_html() when `compact` is set, and with
+    `include_link` the absolute URL of the item's first link under "__link".
+    """
+    records = await page.eval_on_selector_all(
+        item_selector, EXTRACT_JS, {"fields": fields, "includeHtml": include_html, "includeLink": include_link}
+    )
+    if include_html and compact:
+        for record in records:
+            record["__html"] = compact_html(record["__html"])
+    return records
+
+
+async def item_htmls(page, item_selector):
+    """Inner HTML of every item matching `item_selector`, in one round trip."""
+    return await page.eval_on_selector_all(item_selector, "items => items.map(item => item.innerHTML)")
+
+
+async def selector_matches(page, item_selector, selector, indexes):
+    """Whether `selector` matches inside each of the items at `indexes`, in one round trip."""
+    return await page.eval_on_selector_all(item_selector, VALIDATE_JS, {"selector": selector, "indexes": list(indexes)})
@@ -0,0 +1,154 @@
+import re
+import torch
+from transformers import LogitsProcessor, StoppingCriteria
+
+# Simple selectors joined by descendant/child/sibling combinators, e.g. "small.author",
+# "td.title > span.titleline", "h2 > a", "#main [itemprop=author]". Pseudo-classes are
+# allowed, pseudo-elements ('::text' in Scrapy style) are not: querySelector rejects them.
+SIMPLE_SELECTOR = r"(?:[a-zA-Z][\w-]*|\*)?(?:[.#][a-zA-Z_-][\w-]*|\[[\w-]+(?:[~|^$*]?=[\"']?[^\]\"']*[\"']?)?\]|:[\w-]+(?:\([^)]*\))?)*"
+SELECTOR_PATTERN = re.compile(rf"(?<![\w.#-])(?=[a-zA-Z*.#\[]){SIMPLE_SELECTOR}(?:\s*[>+~]\s*(?=[a-zA-Z*.#\[]){SIMPLE_SELECTOR}|\s+(?=[a-zA-Z*.#\[]){SIMPLE_SELECTOR})*")
+SELECTOR_CHARS = re.compile(r"[\w\-.#\[\]=\"'>~+*:() ]+")
+SELECTOR_START = re.compile(r" ?[a-zA-Z*.#\[]")
+
+_vocab_cache = {}
+_selector_ids_cache = {}
+
+
+def _vocab(tokenizer):
+    """Decoded text of every token id, computed once per tokenizer."""
+    key = id(tokenizer)
+    if key not in _vocab_cache:
+        _vocab_cache[key] = tokenizer.batch_decode([[i] for i in range(len(tokenizer))])
+    return _vocab_cache[key]
+
+
+def _selector_ids(tokenizer):
+    """Ids of the tokens a selector may contain, and of those that may start one, computed once per tokenizer."""
+    key = id(tokenizer)
+    if key not in _selector_ids_cache:
+        vocab = _vocab(tokenizer)
+        allowed_ids = [i for i, text in enumerate(vocab) if text and SELECTOR_CHARS.fullmatch(text)]
+        start_ids = [i for i in allowed_ids if SELECTOR_START.match(vocab[i])]
+        _selector_ids_cache[key] = allowed_ids, start_ids
+    return _selector_ids_cache[key]
+
+
+def _mask(token_ids, size, device):
+    mask = torch.zeros(size, dtype=torch.bool, device=device)
+    mask[[i for i in token_ids if i < size]] = True
+    return mask
+
+
+class SelectorLogitsProcessor(LogitsProcessor):
+    """
+    Restricts decoding to tokens made of CSS selector characters. The first token must
+    start a selector, newlines and prose punctuation are never allowed, and EOS becomes
+    available once something has been generated.
+    """
+
+    def __init__(self, tokenizer):
+        self.eos_token_id = tokenizer.eos_token_id
+        self.allowed_ids, self.start_ids = _selector_ids(tokenizer)
+        self.prompt_length = None
+        self._masks = None
+
+    def __call__(self, input_ids, scores):
+        if self._masks is None:
+            self.prompt_length = input_ids.shape[1]
+            size = scores.shape[-1]
+            self._masks = (
+                _mask(self.start_ids, size, scores.device),
+                _mask(self.allowed_ids + [self.eos_token_id], size, scores.device),
+            )
+        mask = self._masks[0] if input_ids.shape[1] == self.prompt_length else self._masks[1]
+        return scores.masked_fill(~mask, float("-inf"))
+
+
+class SelectorStoppingCriteria(StoppingCriteria):
+    """
+    Stops as soon as the output is a complete selector followed by whitespace.
+    Shares the prompt length recorded by the SelectorLogitsProcessor of the same call.
+    """
+
+    def __init__(self, tokenizer, processor):
+        self.tokenizer = tokenizer
+        self.processor = processor
+
+    def __call__(self, input_ids, scores, **kwargs):
+        done = []
+        for row in input_ids:
+            text = self.tokenizer.decode(row[self.processor.prompt_length:], skip_special_tokens=True)
+            selector = text.strip()
+            done.append(
+                bool(selector)
+                and text[-1].isspace()
+                and selector[-1] not in ">+~"
+                and SELECTOR_PATTERN.fullmatch(selector) is not None
+            )
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+
+class SchemaLogitsProcessor(LogitsProcessor):
+    """
+    Forces output of the shape 'Topic: ...\\nEntities: ...\\nSummary: ...' and then EOS.
+    Each header is forced token by token, the model writes the value freely until it emits
+    a newline (or hits the field's token cap, which forces one), and EOS is only allowed
+    inside the last field. Works per row, so it can be used with batched generate().
+    """
+
+    def __init__(self, tokenizer, eos_token_ids=None, fields=(("Topic", 12), ("Entities", 48), ("Summary", 80))):
+        vocab = _vocab(tokenizer)
+        self.vocab = vocab
+        if eos_token_ids is None:
+            eos_token_ids = tokenizer.eos_token_id
+        self.eos_token_ids = [eos_token_ids] if isinstance(eos_token_ids, int) else list(eos_token_ids)
+        self.eos_token_id = self.eos_token_ids[0]
+        self.newline_id = tokenizer("\n", add_special_tokens=False)["input_ids"][0]
+        self.headers = [tokenizer(f"{name}:", add_special_tokens=False)["input_ids"] for name, _ in fields]
+        self.caps = [cap for _, cap in fields]
+        self.prompt_length = None
+        self.states = None
+
+    def _advance(self, state, token_id):
+        if state["phase"] == "header":
+            state["position"] += 1
+            if state["position"] == len(self.headers[state["field"]]):
+                state["phase"] = "value"
+                state["value_tokens"] = 0
+        elif state["phase"] == "value":
+            state["value_tokens"] += 1
+            last_field = state["field"] == len(self.headers) - 1
+            if token_id in self.eos_token_ids:
+                state["phase"] = "done"
+            elif token_id < len(self.vocab) and "\n" in self.vocab[token_id] and state["value_tokens"] > 1:
+                if last_field:
+                    state["phase"] = "done"
+                else:
+                    state["field"] += 1
+                    state["phase"] = "header"
+                    state["position"] = 0
+
+    def __call__(self, input_ids, scores):
+        if self.states is None:
+            self.prompt_length = input_ids.shape[1]
+            self.states = [{"phase": "header", "field": 0, "position": 0} for _ in range(input_ids.shape[0])]
+        else:
+            for state, token_id in zip(self.states, input_ids[:, -1].tolist()):
+                self._advance(state, token_id)
+
+        forced = torch.full_like(scores, float("-inf"))
+        for row, state in enumerate(self.states):
+            last_field = state["field"] == len(self.headers) - 1
+            if state["phase"] == "header":
+                token_id = self.headers[state["field"]][state["position"]]
+            elif state["phase"] == "done":
+                token_id = self.eos_token_id
+            elif state["value_tokens"] >= self.caps[state["field"]]:
+                token_id = self.eos_token_id if last_field else self.newline_id
+            else:
+                if not last_field:
+                    scores[row, self.eos_token_ids] = float("-inf")
+                continue
+            forced[row, token_id] = 0
+            scores[row] = forced[row]
+        return scores
@@ -0,0 +1,285 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from playwright.async_api import async_playwright
+
+from anonymizer import anonymize
+from bulk_extract import extract_records, item_htmls, selector_matches
+from metrics import metrics
+from pipeline import InferencePipeline
+from resource_policy import PageStats, ResourcePolicy, print_page_stats
+from robots import HostScheduler, RobotsCache
+from seen_index import item_fingerprint
+from selector_resolver import SelectorResolver
+from static_page import StaticPage, fetch_html
+
+
+async def _read_records(site, resolvers, run_sync, read_htmls, matches, read):
+    """
+    Infers the described fields' selectors from the items' HTML, then reads every record.
+    Each record notes under '__selector' the selector its analysed field was read with.
+    """
+    if site.fields:
+        fields = {name: field_spec.get("selector") for name, field_spec in site.fields.items()}
+    else:
+        fields = {site.analyze_field: None}
+    if resolvers:
+        with metrics.timer("extraction"):
+            htmls = await read_htmls()
+        for name, resolver in resolvers.items():
+            fields[name] = await resolver.resolve_htmls_async(htmls, matches, run_sync)
+    with metrics.timer("extraction"):
+        records = await read(fields)
+    selectors = fields[site.analyze_field]
+    for index, record in enumerate(records):
+        selector = selectors[index] if isinstance(selectors, list) else selectors
+        record["__selector"] = selector or site.item_selector
+    return [record for record in records if record[site.analyze_field]]
+
+
+async def extract_items(page, url, site, resolvers, run_sync, stats):
+    """
+    Loads one listing page and returns a {field: text} dict per item that has the analysed field.
+    Items are read with a handful of page evaluations rather than a round trip per element.
+    """
+    start_time = time.time()
+    with metrics.timer("navigation"):
+        await page.goto(url, timeout=site.goto_timeout, wait_until=site.wait_until)
+        await page.wait_for_selector(site.wait_selector)
+    stats.time_to_selector = time.time() - start_time
+
+    async def htmls():
+        return await item_htmls(page, site.item_selector)
+
+    async def matches(selector, indexes):
+        return await selector_matches(page, site.item_selector, selector, indexes)
+
+    async def records(fields):
+        return await extract_records(page, site.item_selector, fields, include_link=True)
+
+    return await _read_records(site, resolvers, run_sync, htmls, matches, records)
+
+
+async def extract_static_items(html, url, site, resolvers, run_sync):
+    """extract_items() for a `static` site, reading HTML already fetched over plain HTTP without a browser."""
+    static = StaticPage(html, site.item_selector, url)
+    if not static.has(site.wait_selector):
+        raise ValueError(f"{site.wait_selector!r} is not in the served HTML; the site may need a browser")
+
+    async def htmls():
+        return static.item_htmls()
+
+    async def matches(selector, indexes):
+        return static.selector_matches(selector, indexes)
+
+    async def records(fields):
+        return static.records(fields, include_link=True)
+
+    return await _read_records(site, resolvers, run_sync, htmls, matches, records)
+
+
+async def _browser_items(browser, url, site, resolvers, run_sync, policy, stats):
+    context = await browser.new_context()
+    try:
+        await policy.install(context, url, stats)
+        page = await context.new_page()
+        stats.track(page)
+        records = await extract_items(page, url, site, resolvers, run_sync, stats)
+        await stats.settle()
+        return records
+    finally:
+        await context.close()
+
+
+def _new_records(records, url, site, index):
+    """
+    Drops the records `index` has seen on an earlier run, and repeats within the page.
+    Returns (record, link, selector, fingerprint) tuples; nothing is marked seen yet.
+    """
+    items = []
+    for record in records:
+        link = record.pop("__link", None)
+        selector = record.pop("__selector", None)
+        items.append((record, link, selector, item_fingerprint(record[site.analyze_field], link or url)))
+    if index is None:
+        return items
+    new = index.new_fingerprints(site.name, [item[3] for item in items])
+    fresh = []
+    for item in items:
+        if item[3] in new:
+            new.discard(item[3])
+            fresh.append(item)
+    return fresh
+
+
+class _PendingPage:
+    """
+    The new items of one crawled page that are still being analysed. The page's validators
+    go into the index only once every item came back analysed, so a page with failed
+    items is fetched again on the next run instead of being skipped as unchanged.
+    """
+
+    def __init__(self, index, url, validators, count):
+        self.index = index
+        self.url = url
+        self.validators = validators
+        self.remaining = count
+        self.failed = False
+        if count == 0:
+            self._finish()
+
+    def done(self, analysed):
+        self.failed = self.failed or not analysed
+        self.remaining -= 1
+        if self.remaining == 0:
+            self._finish()
+
+    def _finish(self):
+        if not self.failed and self.validators is not None:
+            self.index.set_page(self.url, self.validators)
+
+
+def _fetch_static(url, site, index, stats):
+    """
+    Fetches a static site's page over plain HTTP, conditionally when `index` knows it.
+    Returns (unchanged, html, validators). Only static pages are ever skipped as unchanged:
+    a browser site's served HTML is the shell its listing is loaded into, so it says
+    nothing about the items; those sites rely on the item index alone.
+    """
+    known = index.page_validators(url) if index is not None else None
+    with metrics.timer("navigation"):
+        html, size, validators = fetch_html(url, site.goto_timeout / 1000, validators=known)
+    stats.requests += 1
+    stats.bytes += size
+    unchanged = known is not None and (html is None or validators["content_hash"] == known["content_hash"])
+    return unchanged, html, validators
+
+
+async def crawl_page(browser, url, site, slots, pipeline, resolvers, run_sync, robots, scheduler, policy, page_stats, index):
+    if not await asyncio.to_thread(robots.can_fetch, url):
+        print(f"[{site.name}] skipped {url}, disallowed by robots.txt")
+        return
+    await scheduler.wait_async(url)
+    stats = PageStats()
+    async with slots["site"][site.name], slots["pages"]:
+        start_time = time.time()
+        try:
+            validators = None
+            if site.static:
+                unchanged, html, validators = await asyncio.to_thread(_fetch_static, url, site, index, stats)
+                if unchanged:
+                    index.skipped_pages += 1
+                    metrics.count("pages_unchanged")
+                    print(f"[{site.name}] {url} unchanged since the last run, skipped")
+                    page_stats.append((site.name, stats))
+                    return
+                records = await extract_static_items(html, url, site, resolvers, run_sync)
+                stats.time_to_selector = time.time() - start_time
+            else:
+                records = await _browser_items(browser, url, site, resolvers, run_sync, policy, stats)
+            scraped = len(records)
+            extract_seconds = time.time() - start_time
+            records = await asyncio.to_thread(_new_records, records, url, site, index)
+            metrics.count("pages_crawled")
+            metrics.count("items_scraped", scraped)
+            metrics.count("items_queued", len(records))
+            pending = None
+            if index is not None:
+                pending = await asyncio.to_thread(_PendingPage, index, url, validators, len(records))
+        except Exception as e:
+            print(f"[{site.name}] crawl of {url} failed: {e}")
+            scraped, records = 0, []
+        new = f", {len(records)} new" if index is not None else ""
+        print(f"[{site.name}] {scraped} items{new} from {url} in {time.time() - start_time:.2f}s ({stats.summary()})")
+    page_stats.append((site.name, stats))
+    # Only new items are anonymized and analysed.
+    for record, link, selector, fingerprint in records:
+        anonymize_start = time.time()
+        title = anonymize(record[site.analyze_field])
+        metrics.observe("anonymization", time.time() - anonymize_start)
+        meta = {
+            "site": site.name,
+            "url": url,
+            "link": link,
+            "selector": selector,
+            "analyze_field": site.analyze_field,
+            "record": record,
+            "fingerprint": fingerprint,
+            "page": pending,
+            "timings": {"extract": extract_seconds, "anonymize": time.time() - anonymize_start},
+        }
+        # put() blocks while the LLM stage is behind; keep that off the event loop.
+        await asyncio.to_thread(pipeline.put, title, site.kind, meta)
+
+
+def print_analysis(title, analysis, meta):
+    extras = "".join(f"\n{name}: {value}" for name, value in meta["record"].items() if name != meta["analyze_field"])
+    print(f"\n[{meta['site']}] Title: {title}{extras}\n{analysis['raw'] if analysis else 'Analysis failed'}")
+
+
+async def crawl(sites, max_pages=4, batch_size=8, headless=True, max_queue=64, on_result=print_analysis, index=None):
+    """
+    Crawls every page of every site concurrently, with at most `max_pages` pages open
+    overall and `site.concurrency` per site. Browser sites share one browser, which is
+    not started at all when every site is `static`. Extracted items are streamed
+    into an InferencePipeline that analyses them while crawling continues.
+    With a SeenIndex as `index`, unchanged static pages are skipped and only items not
+    seen on an earlier run are analysed. Returns the pipeline for its stats.
+    """
+    loop = asyncio.get_running_loop()
+    # Selector inference gets its own thread so it never blocks the event loop;
+    # TextGenModel.generate_lock serialises it with the pipeline's worker.
+    llm_executor = ThreadPoolExecutor(max_workers=1)
+
+    def run_sync(fn, *args):
+        return loop.run_in_executor(llm_executor, fn, *args)
+
+    def on_analysed(title, analysis, meta):
+        # Items count as seen only once analysed, so failures and interrupted runs are retried.
+        pending = meta.pop("page", None)
+        on_result(title, analysis, meta)
+        if index is not None and analysis is not None:
+            index.add_items(meta["site"], [meta["fingerprint"]])
+        if pending is not None:
+            pending.done(analysis is not None)
+
+    pipeline = InferencePipeline(on_analysed, batch_size=batch_size, max_queue=max_queue)
+    slots = {
+        "pages": asyncio.Semaphore(max_pages),
+        "site": {site.name: asyncio.Semaphore(site.concurrency) for site in sites},
+    }
+    robots = RobotsCache()
+    scheduler = HostScheduler(robots)
+    tasks = []
+    for site in sites:
+        # One resolver per described field, shared by all of the site's pages.
+        resolvers = {
+            name: SelectorResolver(field_spec["description"])
+            for name, field_spec in site.fields.items() if "description" in field_spec
+        }
+        policy = ResourcePolicy(site.block_resources, site.block_domains, site.block_third_party_scripts)
+        tasks.extend((url, site, resolvers, policy) for url in site.urls)
+    page_stats = []
+
+    async def crawl_all(browser):
+        await asyncio.gather(*(
+            crawl_page(browser, url, site, slots, pipeline, resolvers, run_sync, robots, scheduler, policy, page_stats, index)
+            for url, site, resolvers, policy in tasks
+        ))
+
+    try:
+        if all(site.static for site in sites):
+            # Plain HTTP only; no browser to start.
+            await crawl_all(None)
+        else:
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=headless)
+                try:
+                    await crawl_all(browser)
+                finally:
+                    await browser.close()
+    finally:
+        llm_executor.shutdown(wait=False)
+        await asyncio.to_thread(pipeline.close)
+    print_page_stats(page_stats)
+    return pipeline
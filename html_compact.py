@@ -0,0 +1,123 @@
+from html import escape
+from html.parser import HTMLParser
+
+DROP_TAGS = {"script", "style", "svg", "noscript", "iframe", "template", "canvas"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+KEEP_ATTRS = ("id", "class", "itemprop")
+
+
+class _Element:
+    __slots__ = ("tag", "attrs", "children")
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a tag/class/id/itemprop tree, skipping DROP_TAGS subtrees and comments."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Element(None, [])
+        self.stack = [self.root]
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.dropping or tag in DROP_TAGS:
+            if tag not in VOID_TAGS:
+                self.dropping += 1
+            return
+        element = _Element(tag, [(name, value) for name, value in attrs if name in KEEP_ATTRS and value])
+        self.stack[-1].children.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        if not self.dropping and tag not in DROP_TAGS:
+            self.stack[-1].children.append(_Element(tag, [(n, v) for n, v in attrs if n in KEEP_ATTRS and v]))
+
+    def handle_endtag(self, tag):
+        if self.dropping:
+            if tag not in VOID_TAGS:
+                self.dropping -= 1
+            return
+        # Close up to the matching open tag, tolerating unclosed children.
+        for depth in range(len(self.stack) - 1, 0, -1):
+            if self.stack[depth].tag == tag:
+                del self.stack[depth:]
+                break
+
+    def handle_data(self, data):
+        if not self.dropping and data.strip():
+            self.stack[-1].children.append(" ".join(data.split()))
+
+
+def _skeleton(node):
+    # ids are usually unique per row, so only tag and class decide whether siblings repeat.
+    if isinstance(node, str):
+        return "#text"
+    classes = tuple(value for name, value in node.attrs if name == "class")
+    return (node.tag, classes, tuple(_skeleton(child) for child in node.children))
+
+
+def _dedupe(node):
+    """Keeps only the first of consecutive siblings that share the same markup skeleton."""
+    children = []
+    previous = None
+    for child in node.children:
+        if not isinstance(child, str):
+            _dedupe(child)
+        skeleton = _skeleton(child)
+        if skeleton != previous or isinstance(child, str):
+            children.append(child)
+        previous = skeleton
+    node.children = children
+
+
+def _render(node, max_text, parts):
+    for child in node.children:
+        if isinstance(child, str):
+            if max_text:
+                parts.append(escape(child if len(child) <= max_text else child[:max_text] + "…", quote=False))
+            continue
+        attrs = "".join(f' {name}="{escape(value)}"' for name, value in child.attrs)
+        parts.append(f"<{child.tag}{attrs}>")
+        if child.tag not in VOID_TAGS:
+            _render(child, max_text, parts)
+            parts.append(f"</{child.tag}>")
+    return parts
+
+
+def compact_html(html, tokenizer=None, token_budget=384, max_text=40):
+    """
+    Shrinks an element's inner HTML before it goes into a selector prompt: drops scripts,
+    styles, svg and comments, keeps only id/class/itemprop attributes, truncates text nodes
+    and collapses repeated sibling blocks. With a tokenizer the result is also held to
+    `token_budget` tokens, first by shortening text and then by cutting at a tag boundary.
+    """
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    _dedupe(builder.root)
+
+    def count(text):
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    while True:
+        parts = _render(builder.root, max_text, [])
+        compacted = "".join(parts)
+        if tokenizer is None or count(compacted) <= token_budget:
+            return compacted
+        if max_text > 0:
+            max_text //= 2
+            continue
+        break
+    # Even without text the skeleton is too long: keep whole tags up to the budget.
+    kept = []
+    for part in parts:
+        if count("".join(kept + [part])) > token_budget:
+            break
+        kept.append(part)
+    return "".join(kept)
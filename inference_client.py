@@ -0,0 +1,43 @@
+import json
+import os
+import urllib.error
+import urllib.request
+
+DEFAULT_SERVER_URL = "http://127.0.0.1:8765"
+
+
+class InferenceClient:
+    """Thin JSON client for inference_server.py."""
+
+    def __init__(self, url=DEFAULT_SERVER_URL, timeout=600):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, endpoint, payload):
+        request = urllib.request.Request(
+            f"{self.url}/{endpoint}",
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8"))["error"]
+            except (ValueError, KeyError):
+                message = e.reason
+            raise RuntimeError(f"{self.url}/{endpoint} returned {e.code}: {message}") from None
+
+    def semantics(self, titles, kind="news"):
+        return self._post("semantics", {"titles": list(titles), "kind": kind})["results"]
+
+    def selector(self, parent_html, target_description, use_cache=True, refresh=False):
+        payload = {"html": parent_html, "description": target_description, "use_cache": use_cache, "refresh": refresh}
+        return self._post("selector", payload)["selector"]
+
+
+def get_server_client():
+    """Returns a client when LLM_SERVER_URL is set, so the LLM helpers route to the shared server."""
+    url = os.environ.get("LLM_SERVER_URL")
+    return InferenceClient(url) if url else None
@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from metrics import metrics
+from model import TextGenModel
+from pipeline import InferencePipeline
+from selector_llm import get_css_selector_from_llm
+
+
+class _PendingRequest:
+    """Collects the analyses of one client request, and any batch errors, as the pipeline produces them."""
+
+    def __init__(self, size):
+        self.results = [None] * size
+        self.errors = []
+        self.remaining = size
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        if size == 0:
+            self.done.set()
+
+    def fill(self, index, analysis, error=None):
+        with self._lock:
+            self.results[index] = analysis
+            if error is not None:
+                self.errors.append(error)
+            self.remaining -= 1
+            if self.remaining == 0:
+                self.done.set()
+
+
+def _deliver(title, analysis, meta):
+    meta["pending"].fill(meta["index"], analysis, meta.get("error"))
+
+
+class InferenceServer(ThreadingHTTPServer):
+    """
+    Localhost daemon holding one resident TextGenModel for every scraper.
+    Titles from concurrent /semantics requests share an InferencePipeline, so requests
+    arriving within `batch_wait` seconds of each other are generated in the same batch.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, batch_size=8, batch_wait=0.05):
+        super().__init__(address, _Handler)
+        self.pipeline = InferencePipeline(_deliver, batch_size=batch_size, max_queue=batch_size * 8, batch_wait=batch_wait)
+
+    def analyze(self, titles, kind):
+        pending = _PendingRequest(len(titles))
+        for index, title in enumerate(titles):
+            self.pipeline.put(title, kind=kind, meta={"pending": pending, "index": index})
+        pending.done.wait()
+        if pending.errors:
+            raise RuntimeError(f"inference failed: {pending.errors[-1]}")
+        return pending.results
+
+    def server_close(self):
+        super().server_close()
+        self.pipeline.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._reply(200, {"status": "ok", "model_loaded": TextGenModel._instance is not None})
+        elif self.path == "/metrics":
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/metrics.json":
+            self._reply(200, metrics.snapshot())
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path == "/semantics":
+                results = self.server.analyze(payload["titles"], payload.get("kind", "news"))
+                self._reply(200, {"results": results})
+            elif self.path == "/selector":
+                cache = None if payload.get("use_cache", True) else False
+                selector = get_css_selector_from_llm(
+                    payload["html"], payload["description"], cache=cache, refresh=payload.get("refresh", False)
+                )
+                self._reply(200, {"selector": selector})
+            else:
+                self._reply(404, {"error": "not found"})
+        except (KeyError, ValueError) as e:
+            self._reply(400, {"error": f"bad request: {e}"})
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve selector and semantics inference from one resident model.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--batch-wait", type=float, default=0.05, help="seconds to wait for a batch to fill")
+    args = parser.parse_args()
+
+    # The server runs the model itself; never forward its own calls to a server.
+    os.environ.pop("LLM_SERVER_URL", None)
+    TextGenModel.get_instance()
+    server = InferenceServer((args.host, args.port), batch_size=args.batch_size, batch_wait=args.batch_wait)
+    print(f"Inference server listening on http://{args.host}:{args.port} (set LLM_SERVER_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import atexit
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from metrics import metrics
+
+DEFAULT_CACHE_DIR = os.environ.get("LLM_CACHE_DIR", ".llm_cache")
+
+
+def normalize_input(text):
+    """Collapses whitespace so cosmetic differences in scraped text share a cache entry."""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def make_cache_key(model_name, prompt_version, text, generation_params=None):
+    """Content address of one LLM call: sha256 over model, prompt version, input and params."""
+    payload = json.dumps(
+        [model_name, prompt_version, normalize_input(text), generation_params or {}],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    On-disk cache of LLM outputs backed by SQLite.
+    Entries expire after `ttl` seconds and the least recently used ones are evicted
+    once the cache holds more than `max_entries` rows or `max_bytes` of values.
+    The row count and byte total are kept in memory, expired rows are swept every
+    `sweep_interval` seconds, and access times are written back `touch_batch` at a time,
+    so a hit costs one read and an insert no table scan. Other processes may share the
+    file, so the totals are re-read from disk whenever one of them has written to it.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=6 * 60 * 60, max_entries=100000, max_bytes=256 * 1024 * 1024,
+                 sweep_interval=60, touch_batch=256):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "llm_cache.sqlite3")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.touch_batch = touch_batch
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._touched = {}
+        self._last_sweep = 0.0
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_created ON entries (created_at)")
+        self._conn.commit()
+        self._sync_totals()
+
+    def _sync_totals(self):
+        # data_version only changes when another connection commits to the file.
+        self._data_version, = self._conn.execute("PRAGMA data_version").fetchone()
+        self._count, self._bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, size, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and now - row[2] > self.ttl):
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._touched.pop(key, None)
+                    self._count -= 1
+                    self._bytes -= row[1]
+                self.misses += 1
+                metrics.count("llm_cache_misses")
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= self.touch_batch:
+                self._write_touched()
+                self._conn.commit()
+            self.hits += 1
+            metrics.count("llm_cache_hits")
+            return json.loads(row[0])
+
+    def _write_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def set(self, key, value):
+        data = json.dumps(value, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, data, size, now, now)
+            )
+            self._touched.pop(key, None)
+            if old is None:
+                self._count += 1
+                self._bytes += size
+            else:
+                self._bytes += size - old[0]
+            self._evict(now)
+            self._conn.commit()
+
+    def _within_limits(self):
+        return self._count <= self.max_entries and self._bytes <= self.max_bytes
+
+    def _evict(self, now):
+        # Runs inside set()'s write transaction, so no other process changes the table
+        # between re-reading the totals and deleting.
+        if now - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = now
+            if self.ttl is not None:
+                self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl,))
+            self._sync_totals()
+        elif self._conn.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+            self._sync_totals()
+        if self._within_limits():
+            return
+        # Least recently used first, so pending access times must be on disk.
+        self._write_touched()
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            if self._within_limits():
+                break
+            stale.append((key,))
+            self._count -= 1
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def flush(self):
+        """Writes pending access times to disk."""
+        with self._lock:
+            self._write_touched()
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self._touched.clear()
+            self._count, self._bytes = 0, 0
+
+    def stats(self):
+        with self._lock:
+            count, total = self._count, self._bytes
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+            "bytes": total,
+        }
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """Process-wide cache shared by the selector and semantics helpers."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LLMCache()
+        atexit.register(_default_cache.flush)
+    return _default_cache
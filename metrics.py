@@ -0,0 +1,173 @@
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Stages timed across a run, in pipeline order.
+STAGES = (
+    "model_load", "navigation", "extraction", "anonymization",
+    "tokenization", "prefill", "decode", "selector_inference", "output",
+)
+
+
+class Metrics:
+    """
+    Process-wide stage timers and counters.
+    `with metrics.timer("decode"):` books the block's duration under a stage, and
+    count("tokens_out", n) adds to a counter. Both are thread-safe and cheap enough to
+    leave on in production; snapshot() returns everything as plain data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timers = {}
+        self.counters = {}
+        self.started_at = time.time()
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = {"count": 0, "total": 0.0, "min": seconds, "max": seconds}
+            timer["count"] += 1
+            timer["total"] += seconds
+            timer["min"] = min(timer["min"], seconds)
+            timer["max"] = max(timer["max"], seconds)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        with self._lock:
+            timers = {
+                name: dict(timer, mean=timer["total"] / timer["count"])
+                for name, timer in self.timers.items()
+            }
+            counters = dict(self.counters)
+        rates = {}
+        for stage, tokens in (("prefill", "tokens_in"), ("decode", "tokens_out")):
+            if timers.get(stage, {}).get("total") and counters.get(tokens):
+                rates[f"{stage}_tokens_per_second"] = counters[tokens] / timers[stage]["total"]
+        for cache in ("llm_cache", "prefix_cache"):
+            lookups = counters.get(f"{cache}_hits", 0) + counters.get(f"{cache}_misses", 0)
+            if lookups:
+                rates[f"{cache}_hit_rate"] = counters.get(f"{cache}_hits", 0) / lookups
+        return {
+            "uptime_seconds": time.time() - self.started_at,
+            "timers": timers,
+            "counters": counters,
+            "rates": rates,
+        }
+
+    def to_json(self, path=None):
+        """The snapshot as JSON, also written to `path` when given."""
+        text = json.dumps(self.snapshot(), indent=2, sort_keys=True)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        return text
+
+    def prometheus_text(self, prefix="scraper"):
+        """The snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for name, timer in sorted(snapshot["timers"].items()):
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {timer["total"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {timer["count"]}')
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, value in sorted(snapshot["rates"].items()):
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.started_at = time.time()
+
+    def report(self):
+        snapshot = self.snapshot()
+        print("\n============== STAGE TIMINGS ==============\n")
+        order = [name for name in STAGES if name in snapshot["timers"]]
+        order += sorted(name for name in snapshot["timers"] if name not in STAGES)
+        for name in order:
+            timer = snapshot["timers"][name]
+            print(f"{name:<20} {timer['count']:>7} calls  total {timer['total']:8.2f}s  mean {timer['mean'] * 1000:9.2f}ms")
+        for name, value in sorted(snapshot["counters"].items()):
+            print(f"{name:<20} {value:>7}")
+        for name, value in sorted(snapshot["rates"].items()):
+            print(f"{name:<32} {value:.2f}")
+        print("\n===========================================\n")
+
+
+metrics = Metrics()
+
+
+class GenerationTimer:
+    """
+    A logits processor that leaves the scores alone and splits one generate() call into
+    prefill time (until the first logits are ready) and decode time (the rest).
+    Create it right before generate() and call finish() right after.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_step = None
+
+    def __call__(self, input_ids, scores):
+        if self.first_step is None:
+            self.first_step = time.perf_counter()
+        return scores
+
+    def finish(self, prompt_tokens, new_tokens):
+        end = time.perf_counter()
+        first_step = self.first_step or end
+        metrics.observe("prefill", first_step - self.start)
+        metrics.observe("decode", end - first_step)
+        metrics.count("tokens_in", prompt_tokens)
+        metrics.count("tokens_out", new_tokens)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = metrics.prometheus_text(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = metrics.to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port=9108, host="127.0.0.1"):
+    """Serves /metrics (Prometheus text) and /metrics.json from a background thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
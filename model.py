@@ -1,21 +1,112 @@
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from transformers import AutoConfig, AutoModelForCausalLM, AutoTokenizer
+from transformers.modeling_utils import no_init_weights
+import os
+import threading
+import time
 import torch
+import transformers
+
+from metrics import metrics
 
 model_name = "Qwen/Qwen2.5-0.5B-Instruct"
 
 class TextGenModel:
     _instance = None
+    # generate() is not re-entrant; every caller sharing the instance takes this lock.
+    generate_lock = threading.Lock()
+    _load_lock = threading.Lock()
+
+    # Loading options, overridable through the environment or configure().
+    options = {
+        "quantize": os.environ.get("LLM_QUANTIZE", "0") == "1",
+        "num_threads": int(os.environ.get("LLM_NUM_THREADS", "0")) or None,
+        "cache_dir": os.environ.get("LLM_MODEL_CACHE_DIR", ".model_cache"),
+    }
+    load_seconds = None
+
+    @classmethod
+    def configure(cls, **options):
+        """Changes loading options; only allowed before the model is first used."""
+        unknown = set(options) - set(cls.options)
+        if unknown:
+            raise ValueError(f"Unknown model options: {sorted(unknown)}")
+        if cls._instance is not None:
+            raise RuntimeError("TextGenModel is already loaded")
+        cls.options = dict(cls.options, **options)
+
+    @classmethod
+    def _quantized_path(cls):
+        # The packed int8 layout is tied to the library versions that wrote it.
+        versions = f"torch{torch.__version__}-transformers{transformers.__version__}"
+        return os.path.join(cls.options["cache_dir"], f"{model_name.replace('/', '--')}-int8-{versions}.pt")
+
+    @classmethod
+    def _quantize(cls, model):
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    @classmethod
+    def _load_quantized(cls, path):
+        """
+        Rebuilds the int8 model from its saved state_dict. The file is memory-mapped while
+        loading, which skips a full read into RAM, but the quantized Linear layers repack
+        their weights into memory of their own, so only the other tensors stay mapped.
+        """
+        with no_init_weights():
+            model = AutoModelForCausalLM.from_config(AutoConfig.from_pretrained(model_name))
+        model = cls._quantize(model)
+        state_dict = torch.load(path, mmap=True, weights_only=True)
+        model.load_state_dict(state_dict, assign=True)
+        return model
+
+    @classmethod
+    def _load_model(cls):
+        if cls.options["quantize"]:
+            path = cls._quantized_path()
+            if os.path.exists(path):
+                try:
+                    return cls._load_quantized(path)
+                except Exception as e:
+                    print(f"Could not load {path} ({e}); rebuilding it")
+        # safetensors weights are memory-mapped and copied straight into the
+        # parameters, without a second full-size copy in RAM.
+        model = AutoModelForCausalLM.from_pretrained(
+            model_name,
+            use_safetensors=True,
+            low_cpu_mem_usage=True,
+        )
+        if cls.options["quantize"]:
+            model = cls._quantize(model)
+            os.makedirs(cls.options["cache_dir"], exist_ok=True)
+            # Written aside and renamed into place, so a concurrent start or an interrupted
+            # save never leaves a truncated file behind.
+            path = cls._quantized_path()
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                torch.save(model.state_dict(), temp_path)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return model
 
     @classmethod
     def get_instance(cls):
+        """Loads the model on first use; later calls return the same instance."""
         if cls._instance is None:
-            model = AutoModelForCausalLM.from_pretrained(
-                model_name,
-            )
-            tokenizer = AutoTokenizer.from_pretrained(model_name)
-            cls._instance = {
-                "model": model,
-                "tokenizer": tokenizer
-            }
+            with cls._load_lock:
+                if cls._instance is None:
+                    start_time = time.time()
+                    if cls.options["num_threads"]:
+                        torch.set_num_threads(cls.options["num_threads"])
+                    model = cls._load_model()
+                    model.eval()
+                    model.requires_grad_(False)
+                    tokenizer = AutoTokenizer.from_pretrained(model_name)
+                    cls.load_seconds = time.time() - start_time
+                    metrics.observe("model_load", cls.load_seconds)
+                    print(f"Model loaded in {cls.load_seconds:.2f} seconds.")
+                    cls._instance = {
+                        "model": model,
+                        "tokenizer": tokenizer
+                    }
         return cls._instance
-
@@ -0,0 +1,225 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from metrics import metrics
+
+# One row per analysed item. `fields` holds the item's other scraped fields as JSON.
+# `status` is "ok", or "failed" with the reason in `error` and no topic/entities/summary.
+RESULT_COLUMNS = [
+    ("status", "text"),
+    ("error", "text"),
+    ("site", "text"),
+    ("url", "text"),
+    ("link", "text"),
+    ("title", "text"),
+    ("anonymized_title", "text"),
+    ("selector", "text"),
+    ("topic", "text"),
+    ("entities", "list"),
+    ("summary", "text"),
+    ("fields", "text"),
+    ("extract_seconds", "real"),
+    ("anonymize_seconds", "real"),
+    ("queue_seconds", "real"),
+    ("inference_seconds", "real"),
+    ("analysed_at", "real"),
+]
+
+
+def make_result(title, analysis, meta):
+    """Flattens one pipeline result into a RESULT_COLUMNS row; `meta` is the dict the crawler queued."""
+    failed = analysis is None
+    analysis = analysis or {}
+    timings = meta.get("timings", {})
+    record = meta.get("record", {})
+    analyze_field = meta.get("analyze_field", "title")
+    return {
+        "status": "failed" if failed else "ok",
+        "error": (meta.get("error") or "no analysis returned") if failed else None,
+        "site": meta.get("site"),
+        "url": meta.get("url"),
+        "link": meta.get("link"),
+        "title": record.get(analyze_field),
+        "anonymized_title": title,
+        "selector": meta.get("selector"),
+        "topic": analysis.get("topic"),
+        "entities": analysis.get("entities", []),
+        "summary": analysis.get("summary"),
+        "fields": json.dumps({k: v for k, v in record.items() if k != analyze_field}, ensure_ascii=False),
+        "extract_seconds": timings.get("extract"),
+        "anonymize_seconds": timings.get("anonymize"),
+        "queue_seconds": timings.get("queue"),
+        "inference_seconds": timings.get("inference"),
+        "analysed_at": time.time(),
+    }
+
+
+class _BufferedSink:
+    """
+    Holds at most `flush_every` rows in memory and writes them out when that many are
+    waiting or `flush_interval` seconds have passed since the last write. Not thread-safe;
+    ResultWriter serialises writes and the timed flushes.
+    """
+
+    def __init__(self, path, flush_every=100, flush_interval=5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.flushes = 0
+        self._buffer = []
+        self._last_flush = time.time()
+
+    def write(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_every or time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush_due(self):
+        return bool(self._buffer) and time.time() - self._last_flush >= self.flush_interval
+
+    def flush(self):
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self.flushes += 1
+            self._buffer = []
+        self._last_flush = time.time()
+
+    def close(self):
+        self.flush()
+
+    def _write_rows(self, rows):
+        raise NotImplementedError
+
+
+class JsonlSink(_BufferedSink):
+    """Appends one JSON object per line."""
+
+    def __init__(self, path, flush_every=100, flush_interval=5.0):
+        super().__init__(path, flush_every, flush_interval)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write_rows(self, rows):
+        self._file.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows))
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class ParquetSink(_BufferedSink):
+    """Writes each flush as a Parquet row group. Needs pyarrow."""
+
+    def __init__(self, path, flush_every=1000, flush_interval=30.0):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(f"pyarrow is required to write {path}; install it or use a .jsonl or .sqlite output") from None
+        super().__init__(path, flush_every, flush_interval)
+        types = {"text": pa.string(), "real": pa.float64(), "list": pa.list_(pa.string())}
+        self._pa = pa
+        self._schema = pa.schema([(name, types[kind]) for name, kind in RESULT_COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_rows(self, rows):
+        self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        super().close()
+        self._writer.close()
+
+
+class SqliteSink(_BufferedSink):
+    """Inserts rows into a `results` table; entities are stored as a JSON array."""
+
+    def __init__(self, path, flush_every=100, flush_interval=5.0):
+        super().__init__(path, flush_every, flush_interval)
+        types = {"text": "TEXT", "real": "REAL", "list": "TEXT"}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS results ({', '.join(f'{name} {types[kind]}' for name, kind in RESULT_COLUMNS)})"
+        )
+        # Tables written by an older schema get the columns added since.
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        for name, kind in RESULT_COLUMNS:
+            if name not in existing:
+                self._conn.execute(f"ALTER TABLE results ADD COLUMN {name} {types[kind]}")
+        self._conn.commit()
+        names = [name for name, _ in RESULT_COLUMNS]
+        self._insert = f"INSERT INTO results ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})"
+
+    def _write_rows(self, rows):
+        self._conn.executemany(self._insert, [
+            tuple(json.dumps(row[name], ensure_ascii=False) if kind == "list" else row[name] for name, kind in RESULT_COLUMNS)
+            for row in rows
+        ])
+        self._conn.commit()
+
+    def close(self):
+        super().close()
+        self._conn.close()
+
+
+SINKS = {".jsonl": JsonlSink, ".parquet": ParquetSink, ".sqlite": SqliteSink, ".sqlite3": SqliteSink, ".db": SqliteSink}
+
+
+def open_sink(path):
+    """Picks the sink for `path` by its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unknown output format {extension!r} for {path}; use one of {', '.join(SINKS)}")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return SINKS[extension](path)
+
+
+class ResultWriter:
+    """
+    Output stage of the pipeline: pass it as `on_result` and every analysed item is turned
+    into a RESULT_COLUMNS row and streamed to each of `sinks`. A background thread checks
+    every `check_interval` seconds for sinks whose flush_interval has passed, so buffered
+    rows reach disk even while the pipeline is stalled.
+    """
+
+    def __init__(self, sinks, check_interval=1.0):
+        self.sinks = sinks
+        self.results = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, args=(check_interval,), name="result-flusher", daemon=True)
+        if sinks:
+            self._flusher.start()
+
+    def _flush_periodically(self, check_interval):
+        while not self._stop.wait(check_interval):
+            with self._lock:
+                for sink in self.sinks:
+                    if sink.flush_due():
+                        sink.flush()
+
+    def __call__(self, title, analysis, meta):
+        with metrics.timer("output"):
+            row = make_result(title, analysis, meta)
+            with self._lock:
+                for sink in self.sinks:
+                    sink.write(row)
+                self.results += 1
+
+    def close(self):
+        self._stop.set()
+        if self._flusher.is_alive():
+            self._flusher.join()
+        with self._lock:
+            for sink in self.sinks:
+                sink.close()
+
+    def summary(self):
+        return ", ".join(f"{sink.path}: {sink.rows_written} rows in {sink.flushes} flushes" for sink in self.sinks)
@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+
+from semantics import analyze_titles
+
+_STOP = object()
+
+
+class StageStats:
+    """Item count and busy/wall time for one pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.started_at = None
+        self.finished_at = None
+
+    def add(self, items, seconds):
+        if self.started_at is None:
+            self.started_at = time.time() - seconds
+        self.items += items
+        self.busy += seconds
+        self.finished_at = time.time()
+
+    def summary(self):
+        wall = (self.finished_at - self.started_at) if self.started_at is not None else 0.0
+        rate = self.items / wall if wall else 0.0
+        return f"{self.name:<12} {self.items:>6} items  busy {self.busy:7.2f}s  wall {wall:7.2f}s  {rate:7.2f} items/s"
+
+
+class InferencePipeline:
+    """
+    Streams scraped titles into the LLM while extraction keeps going.
+
+    Producers call put(); a worker thread drains the bounded queue in micro-batches
+    of up to `batch_size` (waiting at most `batch_wait` seconds for a batch to fill)
+    and hands each parsed analysis to `on_result(title, analysis, meta)`. put() blocks
+    once `max_queue` titles are waiting, so a fast scraper cannot outrun the model
+    and memory stays flat however long the listing page is.
+    """
+
+    def __init__(self, on_result, batch_size=8, max_queue=64, batch_wait=0.05, analyze=analyze_titles):
+        self.on_result = on_result
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.analyze = analyze
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.extract_stats = StageStats("extraction")
+        self.inference_stats = StageStats("inference")
+        self.backpressure_wait = 0.0
+        self.max_queue_depth = 0
+        self.error = None
+        self.result_error = None
+        self._last_put = None
+        self._worker = threading.Thread(target=self._run, name="inference-worker", daemon=True)
+        self._worker.start()
+
+    def put(self, title, kind="news", meta=None):
+        """
+        Queues one title; the time since the previous put() is booked as extraction time.
+        A dict `meta` gets the title's queue wait and its batch's inference seconds under "timings",
+        and the exception message under "error" when its batch fails.
+        """
+        now = time.time()
+        self.extract_stats.add(1, now - self._last_put if self._last_put is not None else 0.0)
+        self.queue.put((title, kind, meta, now))
+        self._last_put = time.time()
+        self.backpressure_wait += self._last_put - now
+        self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def _next_batch(self):
+        batch = [self.queue.get()]
+        deadline = time.time() + self.batch_wait
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self.queue.get(timeout=max(0.0, deadline - time.time())))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            by_kind = {}
+            for item in batch:
+                by_kind.setdefault(item[1], []).append(item)
+            for kind, items in by_kind.items():
+                start_time = time.time()
+                error = None
+                try:
+                    analyses = self.analyze([title for title, _, _, _ in items], kind=kind, batch_size=self.batch_size)
+                except Exception as e:
+                    self.error = error = e
+                    analyses = [None] * len(items)
+                seconds = time.time() - start_time
+                self.inference_stats.add(len(items), seconds)
+                for (title, _, meta, queued_at), analysis in zip(items, analyses):
+                    if isinstance(meta, dict):
+                        meta.setdefault("timings", {}).update(queue=start_time - queued_at, inference=seconds)
+                        if error is not None:
+                            meta["error"] = f"{type(error).__name__}: {error}"
+                    # A failing consumer must not kill the worker, or put() and close() block forever.
+                    try:
+                        self.on_result(title, analysis, meta)
+                    except Exception as e:
+                        if self.result_error is None:
+                            print(f"Result handler failed: {type(e).__name__}: {e}")
+                        self.error = self.result_error = e
+            if stop:
+                return
+
+    def close(self):
+        """Waits for every queued title to be analysed."""
+        self.queue.put(_STOP)
+        self._worker.join()
+        if self.error is not None:
+            print(f"Pipeline errors occurred, last one: {type(self.error).__name__}: {self.error}")
+
+    def report(self):
+        print("\n========== PIPELINE THROUGHPUT ==========\n")
+        print(self.extract_stats.summary())
+        print(self.inference_stats.summary())
+        print(f"\nBlocked on full queue: {self.backpressure_wait:.2f}s, max queue depth: {self.max_queue_depth}/{self.queue.maxsize}")
+        print("\n=========================================\n")
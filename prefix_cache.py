@@ -0,0 +1,111 @@
+import threading
+import torch
+from transformers import DynamicCache, LogitsProcessorList
+
+from metrics import GenerationTimer, metrics
+
+PLACEHOLDER = "\x00INPUT\x00"
+
+
+def split_chat_template(tokenizer, system, user_template, field):
+    """
+    Renders the chat template with a placeholder for `field` and splits it around it.
+    Returns (prefix_text, lead_text, tail_text). prefix_text is the shared part, cut at the
+    last newline before the input: tokens never span a newline, so prefix tokens plus the
+    tokens of lead_text + input + tail_text are exactly the tokens of the full prompt.
+    lead_text is the rest of that line (e.g. 'Element: ' or an opening quote).
+    """
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user_template.format(**{field: PLACEHOLDER})}
+    ]
+    text = tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+    head_text, tail_text = text.split(PLACEHOLDER)
+    cut = head_text.rfind("\n") + 1
+    return head_text[:cut], head_text[cut:], tail_text
+
+
+def split_matches_full(tokenizer, prefix_text, suffix_text):
+    """Whether tokenizing the prefix and suffix separately gives the tokens of the whole prompt."""
+    def ids(text):
+        return tokenizer(text, add_special_tokens=False)["input_ids"]
+    return ids(prefix_text) + ids(suffix_text) == ids(prefix_text + suffix_text)
+
+
+class PrefixKVCache:
+    """past_key_values of fixed prompt prefixes, prefilled once per prefix text."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model, tokenizer, prefix_text):
+        """Returns (prefix_ids, per-layer (key, value) tensors) for `prefix_text`."""
+        with self._lock:
+            entry = self._entries.get(prefix_text)
+            if entry is not None:
+                self.hits += 1
+                metrics.count("prefix_cache_hits")
+                return entry
+            self.misses += 1
+            metrics.count("prefix_cache_misses")
+            prefix_ids = tokenizer(prefix_text, add_special_tokens=False, return_tensors="pt")["input_ids"].to(model.device)
+            with torch.inference_mode():
+                past_key_values = model(input_ids=prefix_ids, use_cache=True).past_key_values
+            if hasattr(past_key_values, "to_legacy_cache"):
+                past_key_values = past_key_values.to_legacy_cache()
+            entry = (prefix_ids[0].tolist(), past_key_values)
+            self._entries[prefix_text] = entry
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+prefix_kv_cache = PrefixKVCache()
+
+
+def expand_prefix_cache(layers, batch_size):
+    """A fresh DynamicCache holding the prefix for every row; generate() appends to it in place."""
+    return DynamicCache.from_legacy_cache(tuple(
+        (key.expand(batch_size, -1, -1, -1).contiguous(), value.expand(batch_size, -1, -1, -1).contiguous())
+        for key, value in layers
+    ))
+
+
+def generate_with_prefix(model, tokenizer, prefix_text, suffix_ids, **generate_kwargs):
+    """
+    Generates for a batch of prompts that all start with `prefix_text`.
+    Each row is laid out as [prefix | padding | suffix] with the padding masked out, so the
+    cached prefix keys/values line up for every row and only the suffix tokens are prefilled.
+    Position ids follow the attention mask, so the suffix continues right after the prefix.
+    Returns only the newly generated token ids; prefill and decode time go to `metrics`.
+    """
+    prefix_ids, layers = prefix_kv_cache.get(model, tokenizer, prefix_text)
+    width = max(len(ids) for ids in suffix_ids)
+    rows = []
+    masks = []
+    for ids in suffix_ids:
+        padding = width - len(ids)
+        rows.append(prefix_ids + [tokenizer.pad_token_id] * padding + list(ids))
+        masks.append([1] * len(prefix_ids) + [0] * padding + [1] * len(ids))
+    input_ids = torch.tensor(rows, device=model.device)
+    attention_mask = torch.tensor(masks, device=model.device)
+    timer = GenerationTimer()
+    logits_processor = LogitsProcessorList(generate_kwargs.pop("logits_processor", None) or [])
+    logits_processor.append(timer)
+    with torch.inference_mode():
+        generated_ids = model.generate(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            past_key_values=expand_prefix_cache(layers, len(rows)),
+            pad_token_id=tokenizer.pad_token_id,
+            logits_processor=logits_processor,
+            **generate_kwargs
+        )
+    new_ids = generated_ids[:, input_ids.shape[1]:]
+    timer.finish(sum(len(ids) for ids in suffix_ids), int((new_ids != tokenizer.pad_token_id).sum()))
+    return new_ids
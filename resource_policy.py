@@ -0,0 +1,96 @@
+import asyncio
+from urllib.parse import urlsplit
+
+DEFAULT_BLOCKED_TYPES = ("image", "font", "media")
+
+
+def _site_of(host):
+    """Rough registrable domain: the last two labels of the host name."""
+    return ".".join(host.split(".")[-2:])
+
+
+class ResourcePolicy:
+    """
+    Which requests a page may make. Requests of a blocked resource type or to a blocked
+    domain (or any subdomain of it) are aborted, and so are scripts served from a site
+    other than the page's own when `block_third_party_scripts` is set.
+    """
+
+    def __init__(self, blocked_types=DEFAULT_BLOCKED_TYPES, blocked_domains=(), block_third_party_scripts=True):
+        self.blocked_types = set(blocked_types)
+        self.blocked_domains = [domain.lower().lstrip(".") for domain in blocked_domains]
+        self.block_third_party_scripts = block_third_party_scripts
+
+    def should_block(self, resource_type, url, first_party_host):
+        if resource_type in self.blocked_types:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        if any(host == domain or host.endswith("." + domain) for domain in self.blocked_domains):
+            return True
+        return (
+            self.block_third_party_scripts
+            and resource_type == "script"
+            and _site_of(host) != _site_of(first_party_host)
+        )
+
+    async def install(self, context, url, stats):
+        """Routes every request of the Playwright `context` through the policy, counting blocked ones in `stats`."""
+        first_party_host = (urlsplit(url).hostname or "").lower()
+
+        async def handle(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url, first_party_host):
+                stats.blocked += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", handle)
+
+
+class PageStats:
+    """Requests made and blocked, bytes transferred and time until the wait selector appeared, for one page."""
+
+    def __init__(self):
+        self.requests = 0
+        self.blocked = 0
+        self.bytes = 0
+        self.time_to_selector = None
+        self._pending = []
+
+    def track(self, page):
+        """Counts the transferred size of every request `page` finishes; call settle() before reading."""
+        page.on("requestfinished", lambda request: self._pending.append(asyncio.ensure_future(self._add(request))))
+
+    async def _add(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.requests += 1
+        self.bytes += sizes["responseHeadersSize"] + max(sizes["responseBodySize"], 0)
+
+    async def settle(self):
+        await asyncio.gather(*self._pending)
+        self._pending.clear()
+
+    def summary(self):
+        selector = f"{self.time_to_selector:.2f}s" if self.time_to_selector is not None else "n/a"
+        return f"selector after {selector}, {self.bytes / 1024:.0f} KB in {self.requests} requests, {self.blocked} blocked"
+
+
+def print_page_stats(page_stats):
+    """Per-site totals of a crawl's PageStats, given as (site name, stats) pairs."""
+    totals = {}
+    for site_name, stats in page_stats:
+        total = totals.setdefault(site_name, {"pages": 0, "bytes": 0, "requests": 0, "blocked": 0, "selector": 0.0})
+        total["pages"] += 1
+        total["bytes"] += stats.bytes
+        total["requests"] += stats.requests
+        total["blocked"] += stats.blocked
+        total["selector"] += stats.time_to_selector or 0.0
+    for site_name, total in totals.items():
+        print(
+            f"[{site_name}] {total['pages']} pages, {total['bytes'] / 1024:.0f} KB in {total['requests']} requests, "
+            f"{total['blocked']} blocked, {total['selector'] / total['pages']:.2f}s mean time to selector"
+        )
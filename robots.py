@@ -0,0 +1,231 @@
+import asyncio
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import quote, unquote, urlsplit
+
+USER_AGENT = "data-scraping-with-llm"
+
+
+class _Node:
+    __slots__ = ("children", "star", "rule", "end_rule")
+
+    def __init__(self, star=False):
+        self.children = {}
+        self.star = star       # reached through '*': stays active on any character
+        self.rule = None       # (pattern length, allow) for a pattern ending here
+        self.end_rule = None   # same, for a pattern ending here with '$'
+
+
+class RuleIndex:
+    """
+    Allow/Disallow rules of one user-agent group stored in a character trie.
+    is_allowed() walks the path once, so lookup is O(len(path)) for plain prefixes;
+    each '*' in the rules adds at most one extra active trie node.
+    The longest matching pattern wins and Allow wins ties, as in RFC 9309.
+    """
+
+    def __init__(self, crawl_delay=None):
+        self.root = _Node()
+        self.crawl_delay = crawl_delay
+        self.rule_count = 0
+
+    def add(self, pattern, allow):
+        anchored = pattern.endswith("$")
+        if anchored:
+            pattern = pattern[:-1]
+        node = self.root
+        for char in pattern:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _Node(star=char == "*")
+            node = child
+        rule = (len(pattern), allow)
+        if anchored:
+            node.end_rule = max(node.end_rule or rule, rule)
+        else:
+            node.rule = max(node.rule or rule, rule)
+        self.rule_count += 1
+
+    @staticmethod
+    def _closure(nodes):
+        """Adds the nodes reachable through '*' edges without consuming a character."""
+        result = {}
+        stack = list(nodes)
+        while stack:
+            node = stack.pop()
+            if id(node) in result:
+                continue
+            result[id(node)] = node
+            star = node.children.get("*")
+            if star is not None:
+                stack.append(star)
+        return list(result.values())
+
+    def is_allowed(self, path):
+        best = None
+        active = self._closure([self.root])
+        for char in path:
+            for node in active:
+                if node.rule is not None and (best is None or node.rule > best):
+                    best = node.rule
+            next_nodes = []
+            for node in active:
+                child = node.children.get(char)
+                if child is not None:
+                    next_nodes.append(child)
+                if node.star:
+                    next_nodes.append(node)
+            if not next_nodes:
+                return True if best is None else best[1]
+            active = self._closure(next_nodes)
+        for node in active:
+            for rule in (node.rule, node.end_rule):
+                if rule is not None and (best is None or rule > best):
+                    best = rule
+        return True if best is None else best[1]
+
+
+def _normalize_path(path):
+    """Percent-encodes a path consistently so rules and URLs compare byte for byte."""
+    return quote(unquote(path), safe="/*$?=&;:@+,%-._~!'()")
+
+
+def parse_robots(text, user_agent=USER_AGENT):
+    """Parses robots.txt and returns the RuleIndex of the group that applies to `user_agent`."""
+    groups = []
+    current_agents = []
+    current_rules = []
+    last_was_agent = False
+    for raw_line in text.splitlines():
+        line = raw_line.split("#", 1)[0].strip()
+        if ":" not in line:
+            continue
+        field, value = (part.strip() for part in line.split(":", 1))
+        field = field.lower()
+        if field == "user-agent":
+            if not last_was_agent and current_agents:
+                groups.append((current_agents, current_rules))
+                current_agents, current_rules = [], []
+            current_agents.append(value.lower())
+            last_was_agent = True
+            continue
+        last_was_agent = False
+        if field in ("allow", "disallow", "crawl-delay") and current_agents:
+            current_rules.append((field, value))
+    if current_agents:
+        groups.append((current_agents, current_rules))
+
+    # RFC 9309: a group applies when its user-agent equals our product token, case-insensitively.
+    token = user_agent.split("/", 1)[0].split()[0].lower()
+    matching = [rules for agents, rules in groups if token in agents]
+    if not matching:
+        matching = [rules for agents, rules in groups if "*" in agents]
+
+    index = RuleIndex()
+    for rules in matching:
+        for field, value in rules:
+            if field == "crawl-delay":
+                try:
+                    index.crawl_delay = float(value)
+                except ValueError:
+                    pass
+            elif value:
+                index.add(_normalize_path(value), field == "allow")
+    return index
+
+
+def _host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def fetch_robots(host, user_agent=USER_AGENT, timeout=10):
+    """
+    Downloads `host`/robots.txt over plain HTTP.
+    Missing files (4xx) allow everything; server errors and network failures disallow
+    everything until the cache entry expires, following RFC 9309.
+    """
+    request = urllib.request.Request(f"{host}/robots.txt", headers={"User-Agent": user_agent})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return parse_robots(response.read().decode("utf-8", errors="replace"), user_agent)
+    except urllib.error.HTTPError as e:
+        if 400 <= e.code < 500:
+            return RuleIndex()
+    except (urllib.error.URLError, OSError):
+        pass
+    index = RuleIndex()
+    index.add("/", False)
+    return index
+
+
+class RobotsCache:
+    """Per-host robots.txt rules, fetched once and refreshed after `ttl` seconds."""
+
+    def __init__(self, user_agent=USER_AGENT, ttl=24 * 60 * 60, fetch=fetch_robots):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.fetch = fetch
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._host_locks = {}
+
+    def rules_for(self, url):
+        host = _host_key(url)
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        # A per-host lock so concurrent callers fetch each robots.txt only once.
+        with host_lock:
+            entry = self._entries.get(host)
+            if entry is None or time.time() - entry[0] > self.ttl:
+                entry = (time.time(), self.fetch(host, self.user_agent))
+                self._entries[host] = entry
+        return entry[1]
+
+    def can_fetch(self, url):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        return self.rules_for(url).is_allowed(_normalize_path(path))
+
+    def crawl_delay(self, url):
+        return self.rules_for(url).crawl_delay
+
+
+class HostScheduler:
+    """
+    Token bucket per host refilled at one token per Crawl-delay.
+    Requests to the same host are spaced out; different hosts never wait on each other.
+    """
+
+    def __init__(self, robots, default_delay=0.0, burst=1):
+        self.robots = robots
+        self.default_delay = default_delay
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _reserve(self, url):
+        """Takes a token for url's host and returns how long the caller must wait for it."""
+        delay = self.robots.crawl_delay(url)
+        delay = self.default_delay if delay is None else delay
+        host = _host_key(url)
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (float(self.burst), now))
+            if delay > 0:
+                tokens = min(float(self.burst), tokens + (now - updated) / delay)
+            else:
+                tokens = float(self.burst)
+            tokens -= 1
+            self._buckets[host] = (tokens, now)
+        return -tokens * delay if tokens < 0 else 0.0
+
+    async def wait_async(self, url):
+        wait_time = await asyncio.to_thread(self._reserve, url)
+        if wait_time:
+            await asyncio.sleep(wait_time)
+        return wait_time
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+import time
+
+from crawler import crawl, print_analysis
+from llm_cache import get_default_cache
+from metrics import metrics, serve_metrics
+from output_sinks import ResultWriter, open_sink
+from seen_index import SeenIndex
+from sites import SPECS_DIR, load_specs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape and analyse every site described by the given specs in one process.")
+    parser.add_argument("specs", nargs="*", default=[SPECS_DIR], help="spec files or directories (default: specs/)")
+    parser.add_argument("--max-pages", type=int, default=4, help="open pages across all sites")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--full", action="store_true", help="analyse every item, not only those new since the last run")
+    parser.add_argument(
+        "-o", "--output", action="append", default=[],
+        help="stream results to a .jsonl, .parquet or .sqlite file (repeatable); printed when omitted"
+    )
+    parser.add_argument("--metrics-json", help="write stage timings and counters to this JSON file")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this local port while running")
+    args = parser.parse_args(argv)
+
+    sites = load_specs(args.specs)
+    if args.metrics_port:
+        serve_metrics(args.metrics_port)
+        print(f"Metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+    print(f"Running {len(sites)} site spec(s): {', '.join(site.name for site in sites)}")
+    start_time = time.time()
+    index = None if args.full else SeenIndex()
+    writer = ResultWriter([open_sink(path) for path in args.output]) if args.output else None
+    try:
+        pipeline = asyncio.run(crawl(
+            sites, max_pages=args.max_pages, batch_size=args.batch_size, headless=not args.headed,
+            on_result=writer or print_analysis, index=index
+        ))
+    finally:
+        if writer is not None:
+            writer.close()
+    pipeline.report()
+    metrics.report()
+    if args.metrics_json:
+        metrics.to_json(args.metrics_json)
+    print(f"Analysed {pipeline.inference_stats.items} items from {len(sites)} sites in {time.time() - start_time:.2f} seconds.")
+    print(f"LLM cache: {get_default_cache().stats()}")
+    if writer is not None:
+        print(f"Output: {writer.summary()}")
+    if index is not None:
+        print(f"Seen index: {index.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from llm_cache import normalize_input
+
+DEFAULT_INDEX_DIR = os.environ.get("CRAWL_INDEX_DIR", ".crawl_index")
+
+
+def item_fingerprint(title, url):
+    """Identity of one scraped item: its normalized title plus a hash of the URL it links to."""
+    url_hash = hashlib.sha256((url or "").encode("utf-8")).hexdigest()
+    payload = f"{normalize_input(title).lower()}\0{url_hash}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SeenIndex:
+    """
+    What earlier runs already scraped, backed by SQLite: item fingerprints per site, and
+    the ETag, Last-Modified and content hash of every listing page. Items not seen for
+    `ttl` seconds are forgotten, so the index stays the size of the sites' recent content.
+    """
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR, ttl=30 * 24 * 60 * 60):
+        os.makedirs(index_dir, exist_ok=True)
+        self.path = os.path.join(index_dir, "seen_index.sqlite3")
+        self.new_items = 0
+        self.seen_items = 0
+        self.skipped_pages = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS items ("
+            " site TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " first_seen REAL NOT NULL,"
+            " last_seen REAL NOT NULL,"
+            " PRIMARY KEY (site, fingerprint))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " content_hash TEXT,"
+            " checked_at REAL NOT NULL)"
+        )
+        if ttl is not None:
+            self._conn.execute("DELETE FROM items WHERE last_seen < ?", (time.time() - ttl,))
+        self._conn.commit()
+
+    def page_validators(self, url):
+        """The {etag, last_modified, content_hash} stored for `url` by the last run, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT etag, last_modified, content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_hash": row[2]}
+
+    def set_page(self, url, validators):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, checked_at) VALUES (?, ?, ?, ?, ?)",
+                (url, validators.get("etag"), validators.get("last_modified"), validators.get("content_hash"), time.time())
+            )
+            self._conn.commit()
+
+    def new_fingerprints(self, site, fingerprints):
+        """
+        Returns the set of `fingerprints` not yet seen for `site`. Known ones get their
+        last_seen refreshed; new ones are only recorded by add_items(), once processed.
+        """
+        now = time.time()
+        with self._lock:
+            known = set()
+            for fingerprint in set(fingerprints):
+                row = self._conn.execute(
+                    "SELECT 1 FROM items WHERE site = ? AND fingerprint = ?", (site, fingerprint)
+                ).fetchone()
+                if row is not None:
+                    known.add(fingerprint)
+            self._conn.executemany(
+                "UPDATE items SET last_seen = ? WHERE site = ? AND fingerprint = ?",
+                [(now, site, fingerprint) for fingerprint in known]
+            )
+            self._conn.commit()
+            new = set(fingerprints) - known
+            self.new_items += len(new)
+            self.seen_items += len(known)
+        return new
+
+    def add_items(self, site, fingerprints):
+        """Records `fingerprints` as seen for `site`."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO items (site, fingerprint, first_seen, last_seen) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (site, fingerprint) DO UPDATE SET last_seen = excluded.last_seen",
+                [(site, fingerprint, now, now) for fingerprint in fingerprints]
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM items")
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            items, = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()
+            pages, = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()
+        scraped = self.new_items + self.seen_items
+        return {
+            "new_items": self.new_items,
+            "seen_items": self.seen_items,
+            "skipped_pages": self.skipped_pages,
+            "new_rate": self.new_items / scraped if scraped else 0.0,
+            "indexed_items": items,
+            "indexed_pages": pages,
+        }
@@ -0,0 +1,112 @@
+import re
+import time
+from transformers import LogitsProcessorList, StoppingCriteriaList
+from model import TextGenModel, model_name
+from llm_cache import get_default_cache, make_cache_key
+from inference_client import get_server_client
+from constrained import SELECTOR_PATTERN, SelectorLogitsProcessor, SelectorStoppingCriteria
+from html_compact import compact_html
+from metrics import metrics
+from prefix_cache import generate_with_prefix, split_chat_template
+
+# Bump whenever the prompt wording changes so cached selectors are not reused.
+PROMPT_VERSION = "3"
+# Decoding is constrained and stops once the selector is complete; this is only a ceiling.
+MAX_NEW_TOKENS = 16
+# Upper bound on prompt tokens spent on the element's HTML after compaction.
+HTML_TOKEN_BUDGET = 384
+
+# The HTML comes last so the system message and instructions form a shared,
+# KV-cacheable prefix.
+USER_PROMPT = "Generate a CSS selector that selects the element described below. Do not include any explanation or extra text. only write valid css selector after the keyword 'selector:'.\n\nElement: {request}"
+SYSTEM_PROMPT = "You are an expert in web scraping. Your ONLY task is to return a valid and short **CSS selector** that selects the requested element from the HTML. Only return the CSS selector string, nothing else. For example, if the HTML is <div class='titleline'> and you want to select the div, just return '.titleline'."
+
+PSEUDO_ELEMENT = re.compile(r"::(?:text|attr\([^)]*\))")
+
+HTML_TAGS = {
+    "a", "abbr", "article", "aside", "b", "blockquote", "button", "cite", "code", "dd", "div", "dl", "dt",
+    "em", "figcaption", "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "i", "img",
+    "label", "li", "main", "nav", "ol", "p", "section", "small", "span", "strong", "table", "tbody",
+    "td", "th", "time", "tr", "u", "ul",
+}
+
+
+def extract_selector(text):
+    """Extracts a valid CSS selector from LLM output."""
+    text = text.strip()
+    if text.lower().startswith("selector:"):
+        text = text[len("selector:"):]
+    # Scrapy-style pseudo-elements are not CSS that a browser can query.
+    text = PSEUDO_ELEMENT.sub("", text)
+    match = SELECTOR_PATTERN.search(text)
+    if not match:
+        return None
+    selector = match.group(0).strip()
+    # The model often drops the dot of a class name; a bare word that is not a tag is a class.
+    if re.fullmatch(r"[a-zA-Z][\w-]*", selector) and selector.lower() not in HTML_TAGS:
+        selector = "." + selector
+    return selector
+
+
+def _generate_selector(parent_html, target_description, compact=True):
+    model_data = TextGenModel.get_instance()
+    model = model_data["model"]
+    tokenizer = model_data["tokenizer"]
+    start_time = time.time()
+    if compact:
+        tokens_before = len(tokenizer(parent_html, add_special_tokens=False)["input_ids"])
+        parent_html = compact_html(parent_html, tokenizer, HTML_TOKEN_BUDGET)
+    prefix_text, lead_text, tail_text = split_chat_template(tokenizer, SYSTEM_PROMPT, USER_PROMPT, "request")
+    # The answer is primed with the 'selector:' keyword the prompt asks for, so decoding
+    # starts directly at the selector.
+    with metrics.timer("tokenization"):
+        suffix_ids = tokenizer(f"{lead_text}{target_description}\n\nHTML:\n{parent_html}{tail_text}selector:", add_special_tokens=False)["input_ids"]
+    processor = SelectorLogitsProcessor(tokenizer)
+    with TextGenModel.generate_lock:
+        generated_ids = generate_with_prefix(
+            model,
+            tokenizer,
+            prefix_text,
+            [suffix_ids],
+            max_new_tokens=MAX_NEW_TOKENS,
+            logits_processor=LogitsProcessorList([processor]),
+            stopping_criteria=StoppingCriteriaList([SelectorStoppingCriteria(tokenizer, processor)]),
+        )
+    response = tokenizer.batch_decode(generated_ids, skip_special_tokens=True)[0]
+    metrics.observe("selector_inference", time.time() - start_time)
+    if compact:
+        tokens_after = len(tokenizer(parent_html, add_special_tokens=False)["input_ids"])
+        print(f"Selector prompt HTML: {tokens_before} -> {tokens_after} tokens, answered in {time.time() - start_time:.2f}s")
+    return extract_selector(response) or response.strip()
+
+
+def get_css_selector_from_llm(parent_html, target_description, cache=None, compact=True, refresh=False):
+    """
+    Asks the model for a CSS selector matching `target_description` inside `parent_html`.
+    The HTML is compacted first (see html_compact.py) unless compact=False.
+    Results are served from the on-disk LLM cache when the same input was seen before;
+    pass cache=False to always run the model, or refresh=True to run it and overwrite the cached entry.
+    When LLM_SERVER_URL is set the request goes to the shared inference server instead.
+    """
+    client = get_server_client()
+    if client is not None:
+        return client.selector(parent_html, target_description, use_cache=cache is not False, refresh=refresh)
+    if cache is False:
+        return _generate_selector(parent_html, target_description, compact)
+    cache = cache or get_default_cache()
+    # Keyed on the compacted markup so elements differing only in scripts, svg,
+    # tracking attributes or long text tails share one entry.
+    key = make_cache_key(
+        model_name,
+        f"selector-{PROMPT_VERSION}",
+        f"{compact_html(parent_html) if compact else parent_html}\n{target_description}",
+        {
+            "max_new_tokens": MAX_NEW_TOKENS, "compact": compact, "html_token_budget": HTML_TOKEN_BUDGET,
+            "quantize": TextGenModel.options["quantize"],
+        }
+    )
+    selector = None if refresh else cache.get(key)
+    if selector is None:
+        selector = _generate_selector(parent_html, target_description, compact)
+        cache.set(key, selector)
+    return selector
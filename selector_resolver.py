@@ -0,0 +1,76 @@
+import hashlib
+from html.parser import HTMLParser
+from selector_llm import get_css_selector_from_llm
+
+
+class _SkeletonParser(HTMLParser):
+    """Collects the tag/class structure of an HTML fragment and drops all text and ids, which are unique per row."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = ".".join(sorted((attrs.get("class") or "").split()))
+        self.parts.append(tag + (f".{classes}" if classes else ""))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        self.parts.append("/")
+
+    def handle_endtag(self, tag):
+        self.parts.append("/")
+
+
+def skeleton_fingerprint(html):
+    """Hash of an element's markup skeleton; elements rendered from the same template share it."""
+    parser = _SkeletonParser()
+    parser.feed(html)
+    parser.close()
+    return hashlib.sha1(" ".join(parser.parts).encode("utf-8")).hexdigest()
+
+
+class SelectorResolver:
+    """
+    Resolves a field selector once per distinct DOM template instead of once per element.
+    Each new skeleton costs one LLM call; the selector is checked against a few siblings
+    with the same skeleton and, if it does not match them, regenerated once, replacing the
+    cached answer so later runs start from the corrected selector.
+    """
+
+    def __init__(self, target_description, validate_siblings=3, selector_fn=get_css_selector_from_llm):
+        self.target_description = target_description
+        self.validate_siblings = validate_siblings
+        self.selector_fn = selector_fn
+        self.selectors = {}
+        self.llm_calls = 0
+
+    def _new_templates(self, htmls):
+        """Fingerprints `htmls` and yields (fingerprint, member indexes) for unseen skeletons."""
+        fingerprints = [skeleton_fingerprint(html) for html in htmls]
+        groups = {}
+        for index, fingerprint in enumerate(fingerprints):
+            groups.setdefault(fingerprint, []).append(index)
+        new = [(fingerprint, members) for fingerprint, members in groups.items() if fingerprint not in self.selectors]
+        return fingerprints, new
+
+    async def resolve_htmls_async(self, htmls, validate, run_sync):
+        """
+        Resolves selectors from already fetched inner HTML, one per entry of `htmls`.
+        `validate(selector, indexes)` is awaited to check a selector against the items at
+        `indexes`, so callers can batch the check into a single page evaluation.
+        """
+        fingerprints, new = self._new_templates(htmls)
+        for fingerprint, members in new:
+            siblings = members[:self.validate_siblings]
+            html = htmls[members[0]]
+            self.llm_calls += 1
+            selector = await run_sync(self.selector_fn, html, self.target_description)
+            if not await validate(selector, siblings):
+                self.llm_calls += 1
+                retry = await run_sync(lambda: self.selector_fn(html, self.target_description, refresh=True))
+                if await validate(retry, siblings):
+                    selector = retry
+            self.selectors[fingerprint] = selector
+        return [self.selectors[fingerprint] for fingerprint in fingerprints]
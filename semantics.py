@@ -0,0 +1,158 @@
+import re
+import torch
+from transformers import LogitsProcessorList
+from model import TextGenModel, model_name
+from llm_cache import get_default_cache, make_cache_key
+from inference_client import get_server_client
+from constrained import SchemaLogitsProcessor
+from prefix_cache import generate_with_prefix, split_chat_template
+from metrics import GenerationTimer, metrics
+
+# Bump whenever the prompt wording changes so cached analyses are not reused.
+PROMPT_VERSION = "2"
+
+# ---------------- Prompt templates ----------------
+# "news" is the wording used by the Hacker News / The Conversation / Ars Technica
+# scripts, "quotes" is the wording used by the quotes.toscrape.com script.
+# The title comes last so everything before it is a shared, KV-cacheable prefix.
+PROMPTS = {
+    "news": {
+        "system": "You are an expert in natural language understanding. Your task is to perform semantic analysis of news headlines. For each title, extract the topic, involved entities, and provide a short contextual summary. Respond ONLY in the given structured format.",
+        "user": "Extract the semantic meaning of the news title below. Identify the topic category (e.g., Technology, Legal, Business), key entities mentioned, and summarize the context briefly. Provide the output in this structured format:\n\nTopic: <category>\nEntities: <list of entities>\nSummary: <1-2 sentence explanation>\n\nNews title:\n\"{title}\"",
+    },
+    "quotes": {
+        "system": "You are an expert in natural language understanding. Your task is to perform semantic analysis of Quotes. For each title, extract the topic, involved entities, and provide a short contextual summary. Respond ONLY in the given structured format.",
+        "user": "Extract the semantic meaning of the Quote below. Identify the topic category, key entities mentioned, and summarize the context briefly. Provide the output in this structured format:\n\nTopic: <category>\nEntities: <list of entities>\nSummary: <1-2 sentence explanation>\n\nQuote:\n\"{title}\"",
+    },
+}
+
+FIELD_PATTERN = re.compile(r"^\s*(Topic|Entities|Summary)\s*:\s*(.*)$", re.IGNORECASE)
+
+
+def build_semantics_prompt(tokenizer, title, kind="news"):
+    """Renders the chat template for a single title."""
+    template = PROMPTS[kind]
+    messages = [
+        {"role": "system", "content": template["system"]},
+        {"role": "user", "content": template["user"].format(title=title)}
+    ]
+    return tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+
+
+def parse_semantics(response):
+    """Splits a 'Topic:/Entities:/Summary:' response into a dict, keeping the raw text."""
+    result = {"topic": None, "entities": [], "summary": None, "raw": response.strip()}
+    current = None
+    for line in response.splitlines():
+        match = FIELD_PATTERN.match(line)
+        if match:
+            current = match.group(1).lower()
+            value = match.group(2).strip()
+        elif current == "summary" and line.strip():
+            value = (result["summary"] + " " + line.strip()).strip()
+        else:
+            continue
+        if current == "entities":
+            result["entities"] = [e.strip() for e in value.strip("[]").split(",") if e.strip()]
+        else:
+            result[current] = value
+    return result
+
+
+def _length_buckets(lengths, batch_size):
+    """Groups indices so each batch holds prompts of similar token length."""
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def analyze_titles(titles, kind="news", batch_size=8, max_new_tokens=150, cache=None, use_prefix_cache=True, constrained=True, **generate_kwargs):
+    """
+    Runs semantic analysis over many titles with batched generate() calls.
+    Prompts are bucketed by length; results come back in input order.
+    With use_prefix_cache the shared system/instruction prefix is prefilled once and its
+    past_key_values reused, so each batch only prefills the titles themselves.
+    With constrained decoding the output is forced into the Topic/Entities/Summary schema
+    and generation stops right after the summary line.
+    Titles already in the on-disk LLM cache skip inference; pass cache=False to disable it.
+    When LLM_SERVER_URL is set the titles are sent to the shared inference server instead.
+    """
+    client = get_server_client()
+    if client is not None:
+        return client.semantics(titles, kind)
+
+    results = [None] * len(titles)
+    keys = [None] * len(titles)
+    pending = list(range(len(titles)))
+    if cache is not False:
+        cache = cache or get_default_cache()
+        params = dict(
+            generate_kwargs, max_new_tokens=max_new_tokens, constrained=constrained,
+            quantize=TextGenModel.options["quantize"]
+        )
+        pending = []
+        for i, title in enumerate(titles):
+            keys[i] = make_cache_key(model_name, f"semantics-{kind}-{PROMPT_VERSION}", title, params)
+            results[i] = cache.get(keys[i])
+            if results[i] is None:
+                pending.append(i)
+    if not pending:
+        return results
+
+    model_data = TextGenModel.get_instance()
+    model = model_data["model"]
+    tokenizer = model_data["tokenizer"]
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
+
+    with metrics.timer("tokenization"):
+        if use_prefix_cache:
+            template = PROMPTS[kind]
+            prefix_text, lead_text, tail_text = split_chat_template(tokenizer, template["system"], template["user"], "title")
+            encoded = tokenizer([lead_text + titles[i] + tail_text for i in pending], add_special_tokens=False)["input_ids"]
+        else:
+            prompts = [build_semantics_prompt(tokenizer, titles[i], kind) for i in pending]
+            encoded = tokenizer(prompts)["input_ids"]
+
+    for bucket in _length_buckets([len(ids) for ids in encoded], batch_size):
+        batch_kwargs = dict(generate_kwargs)
+        batch_kwargs["logits_processor"] = LogitsProcessorList()
+        if constrained:
+            # The processor tracks each row's position in the schema, so one per generate() call.
+            processor = SchemaLogitsProcessor(tokenizer, model.generation_config.eos_token_id)
+            batch_kwargs["logits_processor"].append(processor)
+        if use_prefix_cache:
+            with TextGenModel.generate_lock:
+                generated_ids = generate_with_prefix(
+                    model,
+                    tokenizer,
+                    prefix_text,
+                    [encoded[j] for j in bucket],
+                    max_new_tokens=max_new_tokens,
+                    **batch_kwargs
+                )
+        else:
+            model_inputs = tokenizer.pad(
+                {"input_ids": [encoded[j] for j in bucket]},
+                padding=True,
+                return_tensors="pt"
+            ).to(model.device)
+            with TextGenModel.generate_lock, torch.inference_mode():
+                timer = GenerationTimer()
+                batch_kwargs["logits_processor"].append(timer)
+                generated_ids = model.generate(
+                    **model_inputs,
+                    max_new_tokens=max_new_tokens,
+                    pad_token_id=tokenizer.pad_token_id,
+                    **batch_kwargs
+                )
+            # With left padding every row's prompt ends at the same column.
+            generated_ids = generated_ids[:, model_inputs["input_ids"].shape[1]:]
+            timer.finish(int(model_inputs["attention_mask"].sum()), int((generated_ids != tokenizer.pad_token_id).sum()))
+        responses = tokenizer.batch_decode(generated_ids, skip_special_tokens=True)
+        for j, response in zip(bucket, responses):
+            i = pending[j]
+            results[i] = parse_semantics(response)
+            if cache is not False:
+                cache.set(keys[i], results[i])
+    return results
@@ -0,0 +1,85 @@
+import json
+import os
+from dataclasses import dataclass, field, fields
+
+from resource_policy import DEFAULT_BLOCKED_TYPES
+
+SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+
+
+@dataclass
+class SiteConfig:
+    """
+    What to scrape from one site.
+    Every URL in `urls` is a listing page; items matching `item_selector` are read field by
+    field. A field is {"selector": css} or {"description": text}, in which case its selector
+    is inferred by the LLM once per DOM template. With no fields the item's own text becomes
+    the `analyze_field`. That field is anonymized and sent to semantic analysis with the
+    `kind` prompt wording. At most `concurrency` of the site's pages are open at once.
+    Requests of the `block_resources` types, to `block_domains` and, unless disabled, scripts
+    from other sites are aborted; navigation waits for `wait_until`. A `static` site needs no
+    JavaScript and is fetched over plain HTTP and parsed without a browser.
+    """
+    name: str
+    urls: list
+    wait_selector: str
+    item_selector: str
+    fields: dict = field(default_factory=dict)
+    analyze_field: str = "title"
+    kind: str = "news"
+    goto_timeout: int = 30000
+    concurrency: int = 1
+    block_resources: list = field(default_factory=lambda: list(DEFAULT_BLOCKED_TYPES))
+    block_domains: list = field(default_factory=list)
+    block_third_party_scripts: bool = True
+    wait_until: str = "domcontentloaded"
+    static: bool = False
+
+
+def site_from_spec(spec):
+    """Builds a SiteConfig from one spec mapping; 'url' is accepted for a single page."""
+    spec = dict(spec)
+    if "url" in spec:
+        spec["urls"] = [spec.pop("url")] + list(spec.get("urls", []))
+    known = {f.name for f in fields(SiteConfig)}
+    unknown = set(spec) - known
+    if unknown:
+        raise ValueError(f"Unknown keys in site spec {spec.get('name')!r}: {sorted(unknown)}")
+    site = SiteConfig(**spec)
+    for name, field_spec in site.fields.items():
+        if not isinstance(field_spec, dict) or len(set(field_spec) & {"selector", "description"}) != 1:
+            raise ValueError(f"Field {name!r} of site {site.name!r} needs exactly one of 'selector' or 'description'")
+    if site.fields and site.analyze_field not in site.fields:
+        raise ValueError(f"analyze_field {site.analyze_field!r} is not a field of site {site.name!r}")
+    return site
+
+
+def _read_spec_file(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(f"PyYAML is required to read {path}; install it or use a .json spec") from None
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    if isinstance(data, dict) and "sites" in data:
+        data = data["sites"]
+    return data if isinstance(data, list) else [data]
+
+
+def load_specs(paths=(SPECS_DIR,)):
+    """Loads SiteConfigs from spec files (JSON, or YAML with PyYAML) and directories of them."""
+    sites = []
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".json", ".yaml", ".yml"))
+            )
+        else:
+            files = [path]
+        for spec_file in files:
+            sites.extend(site_from_spec(spec) for spec in _read_spec_file(spec_file))
+    return sites
@@ -0,0 +1,92 @@
+import gzip
+import urllib.error
+import urllib.request
+from urllib.parse import urljoin
+
+from robots import USER_AGENT
+from seen_index import content_hash
+
+
+def fetch_html(url, timeout=30, user_agent=USER_AGENT, validators=None):
+    """
+    Downloads `url` without a browser. Returns the decoded HTML, the bytes transferred and the
+    page's {etag, last_modified, content_hash}. With the `validators` of an earlier fetch the
+    request is conditional, and a 304 Not Modified returns None for the HTML.
+    """
+    headers = {"User-Agent": user_agent, "Accept-Encoding": "gzip"}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            body = response.read()
+            response_headers = response.headers
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and validators:
+            return None, len(str(e.headers)), validators
+        raise
+    size = len(body) + len(str(response_headers))
+    if response_headers.get("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    html = body.decode(response_headers.get_content_charset() or "utf-8", errors="replace")
+    return html, size, {
+        "etag": response_headers.get("ETag"),
+        "last_modified": response_headers.get("Last-Modified"),
+        "content_hash": content_hash(html),
+    }
+
+
+def _text(element):
+    return " ".join(element.get_text().split())
+
+
+class StaticPage:
+    """
+    Items of a page parsed without JavaScript, for sites whose listing is in the served HTML.
+    Offers the same reads as bulk_extract does on a live page. Needs BeautifulSoup.
+    """
+
+    def __init__(self, html, item_selector, url=None):
+        try:
+            from bs4 import BeautifulSoup
+        except ImportError:
+            raise ImportError("beautifulsoup4 is required for static sites; install it or drop 'static' from the spec") from None
+        self.url = url
+        self.soup = BeautifulSoup(html, "html.parser")
+        self.items = self.soup.select(item_selector)
+
+    def has(self, selector):
+        return self.soup.select_one(selector) is not None
+
+    def item_htmls(self):
+        return [item.decode_contents() for item in self.items]
+
+    def selector_matches(self, selector, indexes):
+        try:
+            return all(index < len(self.items) and self.items[index].select_one(selector) is not None for index in indexes)
+        except Exception:
+            return False
+
+    def _link(self, item):
+        link = item if item.name == "a" and item.has_attr("href") else item.select_one("a[href]")
+        return urljoin(self.url or "", link["href"]) if link is not None else None
+
+    def records(self, fields, include_link=False):
+        """Same shape as bulk_extract.extract_records(): None reads the item itself, a list gives one selector per item."""
+        records = []
+        for index, item in enumerate(self.items):
+            record = {}
+            for name, spec in fields.items():
+                selector = spec[index] if isinstance(spec, list) else spec
+                try:
+                    element = item.select_one(selector) if selector else item
+                except Exception:
+                    element = None
+                record[name] = _text(element) if element is not None else None
+            if include_link:
+                record["__link"] = self._link(item)
+            records.append(record)
+        return records